@@ -0,0 +1,291 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Benchmark Suite
+# Due Date: December 8, 2023
+# Description: This program runs the same workloads against every HashMap implementation and
+# reports ops/sec, peak memory and resize counts as a table and as JSON
+# Usage: python benchmark_suite.py [--sizes N ...] [--function hash_function_1|hash_function_2|fnv1a|...]
+#                                  [--implementations NAME ...] [--workloads NAME ...] [--json FILE]
+
+import argparse
+import gc
+import importlib
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+import hash_functions
+
+
+# Implementation name -> (module, method that put calls to grow the table)
+IMPLEMENTATIONS = {
+    'sc': ('hash_map_sc', 'resize_table'),
+    'sc_original': ('hash_map_sc_original', '_resize'),
+    'oa': ('hash_map_oa', '_resize_internal'),
+    'oa_original': ('hash_map_oa_original', '_resize'),
+    'oa_3': ('hash_map_oa_3', 'resize_table'),
+    'rh': ('hash_map_rh', '_resize_internal'),
+    'soa': ('hash_map_soa', '_resize_internal'),
+    'cuckoo': ('hash_map_cuckoo', '_resize_internal'),
+    'hopscotch': ('hash_map_hopscotch', '_resize_internal'),
+    'swiss': ('hash_map_swiss', '_resize_internal'),
+}
+
+FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': hash_functions.fnv1a,
+    'murmur_mix': hash_functions.murmur_mix,
+    'builtin_hash': hash_functions.builtin_hash,
+}
+
+
+class Workload:
+    """
+    A benchmark workload: prepares its input untimed, then runs a timed number of operations
+    """
+
+    def __init__(self, name: str, prebuilt: bool) -> None:
+        """Initialize a workload that starts from an empty or a prebuilt map."""
+        self.name = name
+        self.prebuilt = prebuilt
+
+    def operations(self, size: int) -> int:
+        """Return the number of operations one run performs."""
+        return size
+
+    def prepare(self, module, size: int, rng: random.Random):
+        """Return the argument passed to run, built outside of the timed section."""
+        return None
+
+    def run(self, m, module, argument) -> None:
+        """Perform the timed operations."""
+        raise NotImplementedError
+
+
+class SequentialInsert(Workload):
+    def prepare(self, module, size, rng):
+        return keys_for(size)
+
+    def run(self, m, module, keys):
+        for i, key in enumerate(keys):
+            m.put(key, i)
+
+
+class GetHit(Workload):
+    def prepare(self, module, size, rng):
+        keys = keys_for(size)
+        rng.shuffle(keys)
+        return keys
+
+    def run(self, m, module, keys):
+        for key in keys:
+            m.get(key)
+
+
+class GetMiss(Workload):
+    def prepare(self, module, size, rng):
+        return keys_for(size, 'miss')
+
+    def run(self, m, module, keys):
+        for key in keys:
+            m.get(key)
+
+
+class UpdateHeavy(Workload):
+    def prepare(self, module, size, rng):
+        keys = keys_for(size)
+        return [keys[rng.randrange(size)] for _ in range(size)]
+
+    def run(self, m, module, keys):
+        for i, key in enumerate(keys):
+            m.put(key, -i)
+
+
+class RemoveChurn(Workload):
+    def operations(self, size):
+        return 2 * size
+
+    def prepare(self, module, size, rng):
+        # Each round removes a random live key and inserts a brand new one
+        live = keys_for(size)
+        rounds = []
+        for i in range(size):
+            index = rng.randrange(size)
+            rounds.append((live[index], 'churn' + str(i)))
+            live[index] = 'churn' + str(i)
+        return rounds
+
+    def run(self, m, module, rounds):
+        for i, (old_key, new_key) in enumerate(rounds):
+            m.remove(old_key)
+            m.put(new_key, i)
+
+
+class Iteration(Workload):
+    def run(self, m, module, argument):
+        # Maps without an iterator or items() view are scanned with get_keys_and_values
+        if hasattr(m, 'items'):
+            for _ in m.items():
+                pass
+        elif hasattr(m, '__iter__'):
+            for _ in m:
+                pass
+        else:
+            m.get_keys_and_values()
+
+
+class FindMode(Workload):
+    def prepare(self, module, size, rng):
+        tokens = keys_for(max(1, int(size ** 0.5)), 'token')
+        return DynamicArray([tokens[rng.randrange(len(tokens))] for _ in range(size)])
+
+    def run(self, m, module, da):
+        module.find_mode(da)
+
+
+WORKLOADS = {workload.name: workload for workload in (
+    SequentialInsert('insert', False),
+    GetHit('get_hit', True),
+    GetMiss('get_miss', True),
+    UpdateHeavy('update', True),
+    RemoveChurn('remove_churn', True),
+    Iteration('iteration', True),
+    FindMode('find_mode', False),
+)}
+
+
+def keys_for(count: int, prefix: str = 'key') -> list:
+    """
+    This method returns a list of distinct string keys
+    """
+    return [prefix + str(i) for i in range(count)]
+
+
+def new_map(module, capacity: int, function):
+    """
+    This method returns an empty map of the module's HashMap class
+    """
+    return module.HashMap(capacity, function)
+
+
+def count_resizes(m, method_name: str) -> list:
+    """
+    This method wraps the map's resize method on the instance and returns the one-element counter it updates
+    """
+    counter = [0]
+    method = getattr(m, method_name)
+
+    def counted(*args, **kwargs):
+        counter[0] += 1
+        return method(*args, **kwargs)
+
+    setattr(m, method_name, counted)
+    return counter
+
+
+def run_one(name: str, workload: Workload, size: int, function, capacity: int,
+            seed: int, measure_memory: bool) -> dict:
+    """
+    This method runs one workload against one implementation and returns its result row
+    """
+    module_name, resize_method = IMPLEMENTATIONS[name]
+    module = importlib.import_module(module_name)
+    row = {'implementation': name, 'workload': workload.name, 'size': size,
+           'function': function.__name__, 'ops_per_sec': None, 'peak_bytes': None,
+           'resizes': None, 'error': None}
+
+    if workload.name == 'find_mode' and not hasattr(module, 'find_mode'):
+        row['error'] = 'n/a'
+        return row
+
+    def setup():
+        rng = random.Random(seed)
+        m = new_map(module, capacity, function)
+        if workload.prebuilt:
+            SequentialInsert('insert', False).run(m, module, keys_for(size))
+        return m, workload.prepare(module, size, rng)
+
+    try:
+        # Timed run, with the resize counter attached after any prebuilt setup
+        m, argument = setup()
+        counter = count_resizes(m, resize_method)
+        gc.collect()
+        start = time.perf_counter()
+        workload.run(m, module, argument)
+        seconds = time.perf_counter() - start
+        row['ops_per_sec'] = workload.operations(size) / seconds if seconds else float('inf')
+        row['resizes'] = counter[0]
+        del m, argument
+
+        # Separate traced run, since tracemalloc slows the workload down
+        if measure_memory:
+            m, argument = setup()
+            gc.collect()
+            tracemalloc.start()
+            try:
+                workload.run(m, module, argument)
+                row['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except Exception as error:
+        row['error'] = f"{type(error).__name__}: {error}"
+
+    return row
+
+
+def format_table(rows: list) -> str:
+    """
+    This method formats result rows as a plain-text table
+    """
+    header = f"{'implementation':<14} {'workload':<13} {'size':>10} {'ops/sec':>14} {'peak KiB':>11} {'resizes':>8}"
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        if row['error']:
+            lines.append(f"{row['implementation']:<14} {row['workload']:<13} {row['size']:>10,} {row['error']}")
+            continue
+        peak = f"{row['peak_bytes'] / 1024:,.0f}" if row['peak_bytes'] is not None else '-'
+        lines.append(f"{row['implementation']:<14} {row['workload']:<13} {row['size']:>10,} "
+                     f"{row['ops_per_sec']:>14,.0f} {peak:>11} {row['resizes']:>8}")
+    return '\n'.join(lines)
+
+
+def main(argv: list = None) -> list:
+    """
+    This method parses the command line, runs the selected benchmarks and returns the result rows
+    """
+    parser = argparse.ArgumentParser(description='Run the same workloads against every HashMap implementation')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000])
+    parser.add_argument('--function', choices=sorted(FUNCTIONS), default='hash_function_2')
+    parser.add_argument('--implementations', choices=list(IMPLEMENTATIONS), nargs='+',
+                        default=list(IMPLEMENTATIONS))
+    parser.add_argument('--workloads', choices=list(WORKLOADS), nargs='+', default=list(WORKLOADS))
+    parser.add_argument('--capacity', type=int, default=11, help='initial capacity of every map')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced peak-memory runs')
+    parser.add_argument('--json', metavar='FILE', help="also write the results as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in args.sizes:
+        for name in args.implementations:
+            for workload in args.workloads:
+                rows.append(run_one(name, WORKLOADS[workload], size, FUNCTIONS[args.function],
+                                    args.capacity, args.seed, not args.no_memory))
+
+    print(format_table(rows))
+    if args.json == '-':
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as file:
+            json.dump(rows, file, indent=2)
+
+    return rows
+
+
+if __name__ == "__main__":
+    main()
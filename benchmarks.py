@@ -0,0 +1,769 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Benchmarks
+# Due Date: December 8, 2023
+# Description: This program times the optimized HashMap code paths against the plain ones
+# Usage: python benchmarks.py <benchmark> [--sizes N [N ...]]
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import a6_include
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_batch import hash_many
+import hash_functions
+import hash_primes
+import hash_map_cuckoo
+import hash_map_hopscotch
+import hash_map_oa
+import hash_map_oa_original
+from hash_map_policy import AdaptivePolicy, GrowthPolicy
+import hash_map_rh
+import hash_map_sc
+import hash_map_sc_original
+import hash_map_sharded
+import hash_map_soa
+import hash_map_swiss
+
+
+BENCHMARKS = {}
+
+
+def benchmark(*default_sizes: int):
+    """
+    This method registers a benchmark function together with the sizes it runs at by default
+    """
+    def register(function):
+        BENCHMARKS[function.__name__.removeprefix('bench_')] = (function, default_sizes)
+        return function
+    return register
+
+
+def make_keys(count: int, prefix: str = 'str') -> list:
+    """
+    This method returns a list of distinct string keys shaped like the ones used in the PDF examples
+    """
+    return [prefix + str(i) for i in range(count)]
+
+
+def timed(function, *args) -> float:
+    """
+    This method returns the number of seconds it takes to call the function once
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def report(label: str, count: int, seconds: float, baseline: float = None) -> None:
+    """
+    This method prints one benchmark row as operations per second, with the speedup over the baseline
+    """
+    rate = count / seconds if seconds else float('inf')
+    line = f"{label:<32} {count:>12,} {rate:>16,.0f}/s"
+    if baseline is not None:
+        line += f"   x{baseline / seconds:.2f}" if seconds else "   x-"
+    print(line)
+
+
+# ------------------- BENCHMARKS ------------------------------------------- #
+
+@benchmark(10_000, 1_000_000, 10_000_000)
+def bench_hash_many(size: int) -> None:
+    """
+    Scalar hash function loop against the vectorized hash_many batch
+    """
+    keys = make_keys(size)
+    for function in (hash_function_1, hash_function_2):
+        scalar = timed(lambda: [function(key) for key in keys])
+        batch = timed(hash_many, keys, function)
+        report(f"{function.__name__} scalar", size, scalar)
+        report(f"{function.__name__} hash_many", size, batch, scalar)
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_put_many(size: int) -> None:
+    """
+    Per-key put/get/contains_key loops on the SC HashMap against put_many/get_many/contains_many
+    """
+    keys = make_keys(size)
+    values = list(range(size))
+
+    def put_loop(m):
+        for key, value in zip(keys, values):
+            m.put(key, value)
+
+    def get_loop(m):
+        for key in keys:
+            m.get(key)
+
+    def contains_loop(m):
+        for key in keys:
+            m.contains_key(key)
+
+    for function in (hash_function_1, hash_function_2):
+        loop_map = hash_map_sc.HashMap(11, function)
+        batch_map = hash_map_sc.HashMap(11, function)
+        name = function.__name__
+
+        put = timed(put_loop, loop_map)
+        report(f"put loop ({name})", size, put)
+        report(f"put_many ({name})", size, timed(batch_map.put_many, keys, values), put)
+
+        get = timed(get_loop, loop_map)
+        report(f"get loop ({name})", size, get)
+        report(f"get_many ({name})", size, timed(batch_map.get_many, keys), get)
+
+        contains = timed(contains_loop, loop_map)
+        report(f"contains_key loop ({name})", size, contains)
+        report(f"contains_many ({name})", size, timed(batch_map.contains_many, keys), contains)
+
+
+def percentile(samples: list, fraction: float):
+    """
+    This method returns the sample at the given fraction of a sorted list of samples
+    """
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+@benchmark(100_000, 1_000_000, 5_000_000)
+def bench_incremental_resize(size: int) -> None:
+    """
+    Per-put latency of the SC HashMap with stop-the-world resizing against incremental resizing
+    """
+    # The built-in hash keeps chains short, so the latency measured is the resize itself
+    # rather than the clustering of hash_function_1 / hash_function_2 on these keys
+    keys = make_keys(size)
+    print(f"{'mode':<24} {'total s':>9} {'p50 us':>9} {'p99 us':>9} {'max us':>12}")
+
+    for label, step in (('stop-the-world', None), ('incremental step=4', 4), ('incremental step=16', 16)):
+        m = hash_map_sc.HashMap(11, hash, rehash_step=step)
+        latencies = []
+
+        # Cyclic GC passes over millions of nodes would otherwise show up as put latency
+        gc.disable()
+        clock = time.perf_counter_ns
+        for i, key in enumerate(keys):
+            start = clock()
+            m.put(key, i)
+            latencies.append(clock() - start)
+        gc.enable()
+
+        total = sum(latencies) / 1e9
+        latencies.sort()
+        print(f"{label:<24} {total:>9.2f} {percentile(latencies, 0.5) / 1e3:>9.1f} "
+              f"{percentile(latencies, 0.99) / 1e3:>9.1f} {latencies[-1] / 1e3:>12.1f}")
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_robin_hood(size: int) -> None:
+    """
+    Hit and miss lookups on the quadratic-probing OA HashMap against the Robin Hood variant
+    """
+    keys = make_keys(size)
+    misses = make_keys(size, 'miss')
+
+    def lookups(m, queries):
+        for key in queries:
+            m.get(key)
+
+    for module, load in ((hash_map_oa, 0.45), (hash_map_rh, 0.45), (hash_map_rh, 0.7), (hash_map_rh, 0.84)):
+        # The built-in hash keeps the comparison about probing rather than clustered hash codes
+        m = module.HashMap(int(size / load) + 1, hash)
+        for i, key in enumerate(keys):
+            m.put(key, i)
+
+        name = f"{module.__name__} @ {m.table_load():.2f}"
+        report(f"{name} get hit", size, timed(lookups, m, keys))
+        report(f"{name} get miss", size, timed(lookups, m, misses))
+
+
+def traced_bytes(function, *args):
+    """
+    This method returns the result of calling the function and the bytes it left allocated
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, allocated
+
+
+def filled_map(map_class, keys: list, values: list, *args, **kwargs):
+    """
+    This method returns a new map of the given class with every key/value pair put into it
+    """
+    m = map_class(*args, **kwargs)
+    for key, value in zip(keys, values):
+        m.put(key, value)
+    return m
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_struct_of_arrays(size: int) -> None:
+    """
+    Memory per entry and lookup throughput of the OA HashMap against the struct-of-arrays engine
+    """
+    keys = make_keys(size)
+    values = list(range(size))
+
+    def lookups(m):
+        for key in keys:
+            m.get(key)
+
+    for module in (hash_map_oa, hash_map_soa):
+        # Keys and values are created up front, so only the map's own storage is measured
+        m, allocated = traced_bytes(filled_map, module.HashMap, keys, values, 11, hash)
+        print(f"{module.__name__:<32} {allocated / size:>12.1f} bytes/entry")
+        report(f"{module.__name__} get hit", size, timed(lookups, m))
+
+
+class DictSLNode:
+    """
+    SLNode without __slots__, so every node keeps a per-instance __dict__ as before user-007
+    """
+
+    def __init__(self, key: str, value: object, next: "DictSLNode" = None, hash: int = None) -> None:
+        """Initialize node given a key, value and cached hash code."""
+        self.key = key
+        self.value = value
+        self.next = next
+        self.hash = hash
+
+
+class DictHashEntry:
+    """
+    HashEntry without __slots__, so every entry keeps a per-instance __dict__ as before user-007
+    """
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """Initialize an entry given a key, value and cached hash code."""
+        self.key = key
+        self.value = value
+        self.hash = hash
+        self.is_tombstone = False
+
+
+@benchmark(1_000, 100_000, 1_000_000)
+def bench_memory(size: int) -> None:
+    """
+    Bytes per entry owned by the SC and OA HashMaps, measured with tracemalloc, with the slotted node
+    and entry classes against the same maps building DictSLNode and DictHashEntry objects instead
+    """
+    keys = make_keys(size)
+    values = list(range(size))
+
+    for module, owner, name, baseline in ((hash_map_sc, a6_include, 'SLNode', DictSLNode),
+                                          (hash_map_oa, hash_map_oa, 'HashEntry', DictHashEntry)):
+        # Warm both up first, so neither measurement pays for one-time allocations
+        filled_map_with(owner, name, baseline, module.HashMap, keys[:100], values, 11, hash)
+        filled_map(module.HashMap, keys[:100], values, 11, hash)
+
+        _, before = traced_bytes(filled_map_with, owner, name, baseline, module.HashMap, keys, values, 11, hash)
+        m, after = traced_bytes(filled_map, module.HashMap, keys, values, 11, hash)
+        print(f"{module.__name__:<16} {before / size:>8.1f} bytes/entry with __dict__ "
+              f"{after / size:>8.1f} with __slots__ ({after / before - 1:+.0%})   capacity {m.get_capacity():,}")
+
+
+def filled_map_with(owner, name: str, replacement, map_class, *args):
+    """
+    This method returns filled_map(map_class, *args) built while owner.name is the replacement class
+    """
+    original = getattr(owner, name)
+    setattr(owner, name, replacement)
+    try:
+        return filled_map(map_class, *args)
+    finally:
+        setattr(owner, name, original)
+
+
+@benchmark(10_000, 100_000)
+def bench_tombstone_churn(size: int) -> None:
+    """
+    Lookup throughput of the OA HashMap over time under steady remove/insert churn
+    """
+    rng = random.Random(0)
+    live = make_keys(size)
+    m = filled_map(hash_map_oa.HashMap, live, list(range(size)), 11, hash)
+    misses = make_keys(size // 10, 'miss')
+    print(f"{'churn rounds':>12} {'tombstones':>11} {'capacity':>10} {'get miss/s':>14} {'get hit/s':>14}")
+
+    next_key = 0
+    for window in range(10):
+        # Each round removes a random live key and inserts a brand new one
+        for _ in range(size):
+            index = rng.randrange(size)
+            m.remove(live[index])
+            live[index] = 'churn' + str(next_key)
+            m.put(live[index], next_key)
+            next_key += 1
+
+        hits = rng.sample(live, len(misses))
+        miss_seconds = timed(lambda: [m.get(key) for key in misses])
+        hit_seconds = timed(lambda: [m.get(key) for key in hits])
+        print(f"{(window + 1) * size:>12,} {m.tombstone_buckets():>11,} {m.get_capacity():>10,} "
+              f"{len(misses) / miss_seconds:>14,.0f} {len(hits) / hit_seconds:>14,.0f}")
+
+
+@benchmark(50_000_000)
+def bench_parallel_find_mode(size: int) -> None:
+    """
+    Serial find_mode against find_mode_parallel with 1, 2, 4 and 8 worker processes
+    """
+    rng = random.Random(0)
+    tokens = make_keys(100_000, 'token')
+    da = DynamicArray([tokens[int(rng.paretovariate(1.1)) % len(tokens)] for _ in range(size)])
+
+    serial = timed(hash_map_sc.find_mode, da)
+    report("find_mode (serial)", size, serial)
+    for workers in (1, 2, 4, 8):
+        report(f"find_mode_parallel workers={workers}", size,
+               timed(hash_map_sc.find_mode_parallel, da, workers), serial)
+
+
+@benchmark(100_000, 1_000_000)
+def bench_sharded_threads(size: int) -> None:
+    """
+    Mixed get/put throughput from several threads: one SC HashMap behind a global lock
+    against the striped-lock sharded HashMap
+    """
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"GIL enabled: {gil} (thread scaling is only expected on free-threaded builds)")
+
+    class GlobalLockMap:
+        def __init__(self) -> None:
+            self._map = hash_map_sc.HashMap(size, hash)
+            self._lock = threading.Lock()
+
+        def put(self, key, value):
+            with self._lock:
+                self._map.put(key, value)
+
+        def get(self, key):
+            with self._lock:
+                return self._map.get(key)
+
+    # Both maps are pre-sized, so the comparison is about locking rather than resizing
+    keys = make_keys(size)
+
+    def worker(m, thread_keys):
+        # Three lookups for every write
+        for i, key in enumerate(thread_keys):
+            m.put(key, i)
+            m.get(key)
+            m.get(thread_keys[i // 2])
+            m.get(thread_keys[i // 3])
+
+    for threads in (1, 2, 4, 8):
+        for label, m in (('global lock', GlobalLockMap()),
+                         ('sharded x16', hash_map_sharded.HashMap(size, hash, shards=16))):
+            workers = [threading.Thread(target=worker, args=(m, keys[i::threads])) for i in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            report(f"{label} threads={threads}", 4 * size, time.perf_counter() - start)
+
+
+@benchmark(10_000, 100_000)
+def bench_snapshot(size: int) -> None:
+    """
+    Rebuilding the OA HashMap with put against opening a saved snapshot with open_mapped
+    """
+    keys = make_keys(size)
+    values = list(range(size))
+    path = os.path.join(tempfile.mkdtemp(), 'benchmark.a6oa')
+
+    rebuild = timed(filled_map, hash_map_oa.HashMap, keys, values, 11, hash_function_2)
+    report("rebuild with put", size, rebuild)
+
+    m = filled_map(hash_map_oa.HashMap, keys, values, 11, hash_function_2)
+    report("save", size, timed(m.save, path))
+    print(f"{'snapshot file':<32} {os.path.getsize(path) / 2 ** 20:>12.1f} MiB")
+
+    start = time.perf_counter()
+    mapped = hash_map_oa.open_mapped(path)
+    print(f"{'open_mapped':<32} {(time.perf_counter() - start) * 1e3:>12.3f} ms")
+
+    sample = keys[::max(1, size // 10_000)]
+    report("get in memory", len(sample), timed(lambda: [m.get(key) for key in sample]))
+    report("get mapped", len(sample), timed(lambda: [mapped.get(key) for key in sample]))
+    mapped.close()
+    os.remove(path)
+
+
+@benchmark(10_000, 100_000)
+def bench_instrumentation(size: int) -> None:
+    """
+    Cost of the probe and chain-walk histograms on put and get, with the histograms they record
+    """
+    keys = make_keys(size)
+    values = list(range(size))
+
+    for module in (hash_map_oa, hash_map_sc):
+        # The built-in hash keeps the comparison about the bookkeeping rather than clustered hash codes
+        plain = timed(filled_map, module.HashMap, keys, values, 11, hash)
+        report(f"{module.__name__} put", size, plain)
+        report(f"{module.__name__} put instrumented", size,
+               timed(lambda: filled_map(module.HashMap, keys, values, 11, hash, instrument=True)), plain)
+
+        m = filled_map(module.HashMap, keys, values, 11, hash)
+        plain = timed(lambda: [m.get(key) for key in keys])
+        report(f"{module.__name__} get", size, plain)
+        m = filled_map(module.HashMap, keys, values, 11, hash, instrument=True)
+        m.reset_stats()
+        report(f"{module.__name__} get instrumented", size, timed(lambda: [m.get(key) for key in keys]), plain)
+
+        for key in make_keys(size, 'miss'):
+            m.contains_key(key)
+        for operation, summary in m.stats().items():
+            if summary['count']:
+                print(f"  {operation:<14} mean {summary['mean']:>6.2f}  p50 {summary['p50']:>4}  "
+                      f"p99 {summary['p99']:>4}  max {summary['max']:>4}")
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_hash_functions(size: int) -> None:
+    """
+    Throughput and bucket uniformity of every hash function on keys with numeric suffixes
+    """
+    keys = make_keys(size)
+    capacity = hash_primes.next_prime(size)
+    print(f"{'function':<20} {'keys/s':>14} {'chi2/dof':>10} {'max bucket':>11} {'empty %':>8}")
+
+    for function in (hash_function_1, hash_function_2, hash_functions.fnv1a, hash_functions.murmur_mix,
+                     hash_functions.builtin_hash, hash_functions.seeded_hash(1)):
+        seconds = timed(lambda: [function(key) for key in keys])
+
+        # One key per bucket on average, so a uniform function gives chi2/dof close to 1
+        counts = [0] * capacity
+        for key in keys:
+            counts[function(key) % capacity] += 1
+        expected = size / capacity
+        chi_square = sum((count - expected) ** 2 for count in counts) / expected
+
+        print(f"{function.__name__:<20} {size / seconds:>14,.0f} {chi_square / (capacity - 1):>10.2f} "
+              f"{max(counts):>11,} {100 * counts.count(0) / capacity:>7.1f}%")
+
+
+@benchmark(10_000, 100_000)
+def bench_power_of_two(size: int) -> None:
+    """
+    Prime capacities with modulo indexing against power-of-two capacities with bitmask indexing
+    """
+    keys = make_keys(size)
+    values = list(range(size))
+
+    for module in (hash_map_oa, hash_map_sc):
+        for function in (hash_function_2, hash):
+            name = f"{module.__name__.removeprefix('hash_map_')} {function.__name__}"
+            prime = timed(filled_map, module.HashMap, keys, values, 11, function)
+            report(f"{name} put prime", size, prime)
+            report(f"{name} put 2^k", size,
+                   timed(lambda: filled_map(module.HashMap, keys, values, 11, function, power_of_two=True)), prime)
+
+            m = filled_map(module.HashMap, keys, values, 11, function)
+            prime = timed(lambda: [m.get(key) for key in keys])
+            report(f"{name} get prime", size, prime)
+            m = filled_map(module.HashMap, keys, values, 11, function, power_of_two=True)
+            report(f"{name} get 2^k", size, timed(lambda: [m.get(key) for key in keys]), prime)
+
+
+@benchmark(1_000, 10_000, 100_000)
+def bench_prime_table(size: int) -> None:
+    """
+    Prime capacities from the trial-division _next_prime of the original maps against the prime table
+    """
+    rng = random.Random(0)
+    trial_division = hash_map_sc_original.HashMap(1)
+    capacities = [rng.randrange(size, 1000 * size) for _ in range(10_000)]
+
+    hash_primes.next_prime(size)
+    baseline = timed(lambda: [trial_division._next_prime(capacity) for capacity in capacities])
+    report("next_prime trial division", len(capacities), baseline)
+    report("next_prime table", len(capacities),
+           timed(lambda: [hash_primes.next_prime(capacity) for capacity in capacities]), baseline)
+
+    # A rebalancing job: repeated resize_table calls on a small map to a wide range of capacities
+    keys = make_keys(size // 10)
+    rounds = [rng.randrange(size, 4 * size) for _ in range(200)]
+
+    def rebalance(m) -> None:
+        for capacity in rounds:
+            m.resize_table(capacity)
+
+    for module in (hash_map_oa, hash_map_sc):
+        m = filled_map(module.HashMap, keys, list(range(len(keys))), 11, hash)
+        m._next_prime = trial_division._next_prime
+        baseline = timed(rebalance, m)
+        report(f"{module.__name__} trial division", len(rounds), baseline)
+        m = filled_map(module.HashMap, keys, list(range(len(keys))), 11, hash)
+        report(f"{module.__name__} table", len(rounds), timed(rebalance, m), baseline)
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_views(size: int) -> None:
+    """
+    Scanning a map through get_keys_and_values against the lazy items() view
+    """
+    keys = make_keys(size)
+    values = list(range(size))
+
+    def scan_copy(m) -> None:
+        pairs = m.get_keys_and_values()
+        for index in range(pairs.length()):
+            pairs[index]
+
+    def scan_items(m) -> None:
+        for _ in m.items():
+            pass
+
+    print(f"{'scan':<32} {'pairs/s':>16} {'peak KiB':>12}")
+    for module in (hash_map_oa, hash_map_sc):
+        m = filled_map(module.HashMap, keys, values, 11, hash)
+        for label, scan in (('get_keys_and_values', scan_copy), ('items()', scan_items)):
+            seconds = timed(scan, m)
+            gc.collect()
+            tracemalloc.start()
+            try:
+                scan(m)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            print(f"{module.__name__ + ' ' + label:<32} {size / seconds:>16,.0f} {peak / 1024:>12,.0f}")
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_clear_refill(size: int) -> None:
+    """
+    Clearing a filled map and refilling a small batch, with the original clear as baseline
+    """
+    keys = make_keys(size)
+    batch = keys[:64]
+    cycles = 100
+
+    def clear_refill(m) -> None:
+        for _ in range(cycles):
+            m.clear()
+            for key in batch:
+                m.put(key, key)
+
+    # The built-in hash avoids the clustering of hash_function_1 on generated keys
+    for original, module in ((hash_map_sc_original, hash_map_sc), (hash_map_oa_original, hash_map_oa)):
+        baseline = None
+        for implementation in (original, module):
+            m = implementation.HashMap(11, hash)
+            for key in keys:
+                m.put(key, key)
+            seconds = timed(clear_refill, m)
+            report(f"{implementation.__name__} clear", cycles, seconds, baseline)
+            baseline = baseline or seconds
+
+
+@benchmark(100_000, 1_000_000)
+def bench_purge(size: int) -> None:
+    """
+    Capacity, scan time and memory of a map before and after a purge keeps 0.5% of its keys,
+    with and without automatic shrinking
+    """
+    keys = make_keys(size)
+    values = list(range(size))
+    kept = size // 200
+
+    def purged(module, shrink: bool):
+        m = filled_map(module.HashMap, keys, values, 11, hash, shrink=shrink)
+        for key in keys[kept:]:
+            m.remove(key)
+        return m
+
+    def scan(m) -> None:
+        for _ in m.items():
+            pass
+
+    # The built-in hash avoids the clustering of hash_function_1 on generated keys
+    print(f"{'map':<32} {'capacity':>12} {'scan ms':>10} {'KiB':>12}")
+    for module in (hash_map_oa, hash_map_sc):
+        rows = [('full', *traced_bytes(filled_map, module.HashMap, keys, values, 11, hash))]
+        for label, shrink in (('purged', False), ('purged, shrink', True)):
+            rows.append((label, *traced_bytes(purged, module, shrink)))
+
+        for label, m, allocated in rows:
+            seconds = timed(scan, m)
+            print(f"{module.__name__ + ' ' + label:<32} {m.get_capacity():>12,} "
+                  f"{1000 * seconds:>10.2f} {allocated / 1024:>12,.0f}")
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_growth_policy(size: int) -> None:
+    """
+    Memory, get throughput and probe counts (OA) or chain walks (SC) under the default, a memory-tight,
+    a latency-tight and an adaptive growth policy
+    """
+    keys = make_keys(size)
+    values = list(range(size))
+
+    # Adaptive policies keep state, so every map gets a new policy from its factory
+    policies = {
+        hash_map_oa: (
+            ('default', lambda: None),
+            ('memory-tight', lambda: GrowthPolicy(0.85, 1.5)),
+            ('latency-tight', lambda: GrowthPolicy(0.25)),
+            ('adaptive', lambda: AdaptivePolicy(1.5, 0.5, 0.25, 0.85)),
+        ),
+        hash_map_sc: (
+            ('default', lambda: None),
+            ('memory-tight', lambda: GrowthPolicy(3.0, 1.5)),
+            ('latency-tight', lambda: GrowthPolicy(0.5)),
+            ('adaptive', lambda: AdaptivePolicy(1.5, 1.0, 0.5, 3.0)),
+        ),
+    }
+
+    # The built-in hash avoids the clustering of hash_function_1 on generated keys, and the OA maps
+    # use power-of-two mode since quadratic probing over a prime table stops at a load factor of 0.5
+    print(f"{'policy':<28} {'capacity':>10} {'load':>6} {'KiB':>10} {'gets/s':>12} {'mean':>6} {'p99':>5}")
+    for module, rows in policies.items():
+        for label, policy in rows:
+            m, allocated = traced_bytes(lambda: filled_map(module.HashMap, keys, values, 11, hash,
+                                                           power_of_two=True, policy=policy()))
+            seconds = timed(lambda: [m.get(key) for key in keys])
+
+            instrumented = filled_map(module.HashMap, keys, values, 11, hash, power_of_two=True,
+                                      instrument=True, policy=policy())
+            instrumented.reset_stats()
+            for key in keys:
+                instrumented.get(key)
+            summary = instrumented.stats()['get']
+
+            print(f"{module.__name__ + ' ' + label:<28} {m.get_capacity():>10,} {m.table_load():>6.2f} "
+                  f"{allocated / 1024:>10,.0f} {size / seconds:>12,.0f} {summary['mean']:>6.2f} "
+                  f"{summary['p99']:>5}")
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_worst_case_get(size: int) -> None:
+    """
+    Per-get latency percentiles and the most slots (OA, Robin Hood) or buckets (cuckoo) one get
+    looked at, for hits and misses on nearly full maps
+    """
+    keys = make_keys(size)
+    misses = make_keys(size, 'miss')
+
+    # The built-in hash keeps OA and Robin Hood probing honest; cuckoo always uses its own seeded hash
+    maps = (('oa', hash_map_oa.HashMap(int(size / 0.45) + 1, hash, instrument=True)),
+            ('rh', hash_map_rh.HashMap(int(size / 0.84) + 1, hash, instrument=True)),
+            ('cuckoo', hash_map_cuckoo.HashMap(int(size / 0.85) + 1, hash, instrument=True)))
+
+    print(f"{'map':<24} {'load':>6} {'p50 us':>8} {'p99 us':>8} {'p99.9 us':>9} {'max us':>9} {'max probes':>11}")
+    for name, m in maps:
+        for i, key in enumerate(keys):
+            m.put(key, i)
+
+        for label, queries in (('hit', keys), ('miss', misses)):
+            m.reset_stats()
+            latencies = []
+
+            gc.disable()
+            clock = time.perf_counter_ns
+            for key in queries:
+                start = clock()
+                m.get(key)
+                latencies.append(clock() - start)
+            gc.enable()
+
+            probes = m.stats()['get']['max']
+            latencies.sort()
+            print(f"{name + ' get ' + label:<24} {m.table_load():>6.2f} {percentile(latencies, 0.5) / 1e3:>8.2f} "
+                  f"{percentile(latencies, 0.99) / 1e3:>8.2f} {percentile(latencies, 0.999) / 1e3:>9.2f} "
+                  f"{latencies[-1] / 1e3:>9.1f} {probes:>11}")
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_hopscotch(size: int) -> None:
+    """
+    Puts and hit and miss lookups at high load on the hopscotch map, against the quadratic-probing
+    OA HashMap at its 0.5 limit and the Robin Hood variant
+    """
+    keys = make_keys(size)
+    misses = make_keys(size, 'miss')
+
+    def puts(m):
+        for i, key in enumerate(keys):
+            m.put(key, i)
+
+    def lookups(m, queries):
+        for key in queries:
+            m.get(key)
+
+    for module, load in ((hash_map_oa, 0.45), (hash_map_rh, 0.84), (hash_map_hopscotch, 0.5),
+                         (hash_map_hopscotch, 0.8), (hash_map_hopscotch, 0.89)):
+        # The built-in hash keeps the comparison about probing rather than clustered hash codes
+        m = module.HashMap(int(size / load) + 1, hash, instrument=True)
+        seconds = timed(puts, m)
+
+        name = f"{module.__name__.replace('hash_map_', '')} @ {m.table_load():.2f}"
+        report(f"{name} put", size, seconds)
+        report(f"{name} get hit", size, timed(lookups, m, keys))
+        report(f"{name} get miss", size, timed(lookups, m, misses))
+
+        # Every map here records the slots each get compares, over the hits and misses together
+        summary = m.stats()['get']
+        print(f"  slots compared per get: mean {summary['mean']:.2f}  p99 {summary['p99']}  "
+              f"max {summary['max']}")
+
+
+@benchmark(10_000, 100_000, 1_000_000)
+def bench_swiss_table(size: int) -> None:
+    """
+    Puts, hit and miss lookups and the keys compared per get of the Swiss table map against the
+    quadratic-probing OA HashMap
+    """
+    keys = make_keys(size)
+    misses = make_keys(size, 'miss')
+
+    def puts(m):
+        for i, key in enumerate(keys):
+            m.put(key, i)
+
+    def lookups(m, queries):
+        for key in queries:
+            m.get(key)
+
+    print(f"control bytes in {'a NumPy array' if hash_map_swiss.np is not None else 'a bytearray'}")
+    for function in (hash, hash_function_2):
+        for module in (hash_map_oa, hash_map_swiss):
+            m = module.HashMap(11, function, instrument=True)
+            seconds = timed(puts, m)
+
+            name = f"{module.__name__.replace('hash_map_', '')} {function.__name__}"
+            report(f"{name} put", size, seconds)
+            for label, queries in (('hit', keys), ('miss', misses)):
+                m.reset_stats()
+                report(f"{name} get {label}", size, timed(lookups, m, queries))
+                summary = m.stats()['get']
+                print(f"  keys compared per get: mean {summary['mean']:.2f}  p99 {summary['p99']}  "
+                      f"max {summary['max']}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--sizes', type=int, nargs='+')
+    args = parser.parse_args()
+
+    function, default_sizes = BENCHMARKS[args.benchmark]
+    for size in args.sizes or default_sizes:
+        print(f"\n{args.benchmark} - {size:,} keys")
+        print("-" * 70)
+        function(size)
@@ -0,0 +1,213 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: Hash Distribution Analyzer
+# Due Date: December 8, 2023
+# Description: This program reports how a file of keys would spread over the buckets of a HashMap for
+# each candidate hash function and capacity, reading the keys one line at a time
+# Usage: python hash_analyzer.py KEY_FILE --capacities N [N ...] [--functions NAME ...]
+#                                [--kinds prime power_of_two] [--json FILE]
+
+import argparse
+import json
+import sys
+from array import array
+
+from a6_include import hash_function_1, hash_function_2
+import hash_functions
+from hash_primes import next_prime
+
+
+FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': hash_functions.fnv1a,
+    'murmur_mix': hash_functions.murmur_mix,
+    'builtin_hash': hash_functions.builtin_hash,
+}
+
+KINDS = ('prime', 'power_of_two')
+
+
+def candidate_capacity(capacity: int, kind: str) -> int:
+    """
+    This method rounds a capacity up the way a map of the given kind would: to the prime the maps'
+    _next_prime returns, or to a power of two
+    """
+    if kind == 'prime':
+        return next_prime(capacity)
+    return 1 << max(0, capacity - 1).bit_length()
+
+
+class Distribution:
+    """
+    Running bucket statistics of one hash function at one capacity
+    Memory depends on the capacity only, never on the number of keys added
+    """
+
+    def __init__(self, function, capacity: int, kind: str) -> None:
+        """Initialize empty statistics for the given function and capacity."""
+        self.function = function
+        self.capacity = capacity
+        self.kind = kind
+        self.keys = 0
+
+        # Keys per bucket, with running sums that give chi-square and chain lengths without a final pass
+        self._counts = array('I', bytes(4 * capacity))
+        self._sum_squares = 0
+        self._chain_walk = 0
+        self._max_bucket = 0
+
+        # Slots a simulated OA table has filled, and for each home slot the probe number to try next
+        self._occupied = bytearray(capacity)
+        self._next_probe = array('I', bytes(4 * capacity))
+        self._probes = 0
+        self._oa_full = False
+
+    def add(self, code: int) -> None:
+        """
+        This method adds the hash code of one key
+        """
+        # Home slots as the maps pick them: the code modulo a prime, or the mixed code under a power-of-two mask
+        if self.kind == 'prime':
+            home_index = code % self.capacity
+        else:
+            home_index = hash_functions.mix64(code) & (self.capacity - 1)
+        self.keys += 1
+
+        # SC: the key is one more node in its home chain, a get walks past every node put before it
+        count = self._counts[home_index]
+        self._counts[home_index] = count + 1
+        self._sum_squares += 2 * count + 1
+        self._chain_walk += count + 1
+        if count + 1 > self._max_bucket:
+            self._max_bucket = count + 1
+
+        if not self._oa_full:
+            self._add_open_addressing(home_index)
+
+    def _add_open_addressing(self, home_index: int) -> None:
+        """
+        Helper method that inserts a key into the simulated OA table and counts the slots it probes
+        Keys sharing a home slot follow the same probe sequence and slots are never freed, so every
+        probe before the last one taken from this home slot is known to be full and is skipped
+        """
+        capacity, occupied = self.capacity, self._occupied
+        probe_count = self._next_probe[home_index]
+
+        while probe_count < capacity:
+            if self.kind == 'prime':
+                # Quadratic probing, as in hash_map_oa.HashMap
+                index = (home_index + probe_count * probe_count) % capacity
+            else:
+                # Triangular probing, which visits every slot of a power-of-two table
+                index = (home_index + probe_count * (probe_count + 1) // 2) % capacity
+
+            if not occupied[index]:
+                occupied[index] = 1
+                self._next_probe[home_index] = probe_count + 1
+                self._probes += probe_count + 1
+                return
+            probe_count += 1
+
+        # The probe sequence ran out of slots, the real map would have resized long before
+        self._oa_full = True
+
+    def report(self) -> dict:
+        """
+        This method returns the statistics of the keys added so far
+        """
+        expected = self.keys / self.capacity
+        chi_square = self._sum_squares / expected - self.keys if self.keys else 0.0
+
+        # hash_map_oa.HashMap keeps its load below 0.5, the probe length above that is not meaningful
+        oa_probe = None
+        if self.keys and not self._oa_full and 2 * self.keys <= self.capacity:
+            oa_probe = self._probes / self.keys
+
+        return {
+            'function': self.function.__name__,
+            'kind': self.kind,
+            'capacity': self.capacity,
+            'keys': self.keys,
+            'load': expected,
+            'chi_square': chi_square,
+            'chi_square_per_dof': chi_square / (self.capacity - 1) if self.capacity > 1 else 0.0,
+            'max_bucket': self._max_bucket,
+            'empty_buckets': self._counts.count(0),
+            'sc_chain_walk': self._chain_walk / self.keys if self.keys else 0.0,
+            'oa_probe_length': oa_probe,
+        }
+
+
+def analyze(keys, functions: list, capacities: list, kinds: tuple = ('prime',)) -> list:
+    """
+    This method streams the keys once, hashing each key once per function, and returns one report
+    per function, capacity and kind
+    """
+    distributions = [[Distribution(function, candidate_capacity(capacity, kind), kind)
+                      for capacity in capacities for kind in kinds]
+                     for function in functions]
+
+    for key in keys:
+        for function, group in zip(functions, distributions):
+            code = function(key)
+            for distribution in group:
+                distribution.add(code)
+
+    return [distribution.report() for group in distributions for distribution in group]
+
+
+def read_keys(path: str):
+    """
+    This method yields the keys of a file one per line, without their line endings
+    """
+    with open(path, encoding='utf-8', errors='surrogateescape') as file:
+        for line in file:
+            yield line.rstrip('\r\n')
+
+
+def format_table(rows: list) -> str:
+    """
+    This method formats the reports as a plain-text table
+    """
+    header = (f"{'function':<16} {'kind':<12} {'capacity':>12} {'load':>7} {'chi2/dof':>9} "
+              f"{'max bucket':>10} {'empty %':>8} {'sc walk':>8} {'oa probes':>10}")
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        oa_probe = f"{row['oa_probe_length']:.3f}" if row['oa_probe_length'] is not None else '-'
+        lines.append(f"{row['function']:<16} {row['kind']:<12} {row['capacity']:>12,} {row['load']:>7.3f} "
+                     f"{row['chi_square_per_dof']:>9.3f} {row['max_bucket']:>10,} "
+                     f"{100 * row['empty_buckets'] / row['capacity']:>7.1f}% "
+                     f"{row['sc_chain_walk']:>8.3f} {oa_probe:>10}")
+    return '\n'.join(lines)
+
+
+def main(argv: list = None) -> list:
+    """
+    This method parses the command line, analyzes the key file and returns the reports
+    """
+    parser = argparse.ArgumentParser(description='Report how a file of keys spreads over HashMap buckets')
+    parser.add_argument('keys', help='file with one key per line')
+    parser.add_argument('--capacities', type=int, nargs='+', required=True)
+    parser.add_argument('--functions', choices=list(FUNCTIONS), nargs='+', default=list(FUNCTIONS))
+    parser.add_argument('--kinds', choices=KINDS, nargs='+', default=['prime'],
+                        help='round capacities up to a prime or a power of two')
+    parser.add_argument('--json', metavar='FILE', help="also write the reports as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    rows = analyze(read_keys(args.keys), [FUNCTIONS[name] for name in args.functions],
+                   args.capacities, tuple(args.kinds))
+
+    print(format_table(rows))
+    if args.json == '-':
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as file:
+            json.dump(rows, file, indent=2)
+
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Batch Hashing
+# Due Date: December 8, 2023
+# Description: This program hashes whole batches of keys at once with NumPy array operations
+# so that hash_function_1 and hash_function_2 are not evaluated one character at a time
+
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional, fall back to the scalar loop
+    np = None
+
+
+# Largest key length whose position-weighted sum (hash_function_2) is guaranteed to fit in
+# a signed 64-bit integer: n * (n + 1) / 2 * 0x10FFFF < 2 ** 63
+_MAX_VECTOR_KEY_LENGTH = 4_000_000
+
+
+def as_list(items) -> list:
+    """
+    This method returns the given keys as a Python list
+    DynamicArray disables iteration, so its elements are read back by index
+    """
+    if isinstance(items, DynamicArray):
+        return [items.get_at_index(index) for index in range(items.length())]
+    if isinstance(items, list):
+        return items
+    return list(items)
+
+
+def hash_many(keys, function: callable = hash_function_1) -> list:
+    """
+    This method returns a list with the hash code of every key, in the same order as the keys
+
+    hash_function_1 and hash_function_2 are computed with NumPy over a flat code-point buffer
+    Any other hash function (or a missing NumPy) falls back to calling the function once per key
+    The results are plain Python ints and are identical to the scalar hash functions
+    """
+    keys = as_list(keys)
+
+    if np is None or function not in (hash_function_1, hash_function_2) or not keys:
+        return [function(key) for key in keys]
+
+    # Encode every key into one flat buffer of unicode code points
+    lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    if function is hash_function_2 and lengths.max() > _MAX_VECTOR_KEY_LENGTH:
+        return [function(key) for key in keys]
+
+    codes = np.frombuffer(''.join(keys).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).astype(np.int64)
+
+    # Offset of the first character of every key inside the flat buffer
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+
+    if function is hash_function_2:
+        # Each character is weighted by its 1-based position inside its own key
+        positions = np.arange(codes.size, dtype=np.int64) - np.repeat(starts, lengths) + 1
+        codes = codes * positions
+
+    # Per-key sums are differences of a running total taken at the key boundaries
+    totals = np.zeros(codes.size + 1, dtype=np.int64)
+    np.cumsum(codes, out=totals[1:])
+    return (totals[ends] - totals[starts]).tolist()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nhash_many example 1")
+    print("-------------------")
+    keys = ['', 'a', 'str12', 'str21', 'key' + 'x' * 50, 'ключ', '鍵']
+    for function in (hash_function_1, hash_function_2):
+        batch = hash_many(keys, function)
+        print(function.__name__, batch, batch == [function(key) for key in keys])
+
+    print("\nhash_many example 2")
+    print("-------------------")
+    da = DynamicArray(['apple', 'grape', 'melon'])
+    print(hash_many(da, hash_function_2), hash_many(da, len))
@@ -0,0 +1,118 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: Hash Functions
+# Due Date: December 8, 2023
+# Description: This program provides hash functions that can be passed as function= to either HashMap
+# in place of hash_function_1/2, which collide on anagrams and cluster on keys with numeric suffixes
+#
+# Every function takes a string key and returns a non-negative 64-bit integer
+
+import struct
+
+
+MASK_64 = (1 << 64) - 1
+
+# 64-bit FNV-1a parameters
+FNV_OFFSET = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+
+# MurmurHash3 x64 block and finalizer constants
+_C1 = 0x87c37b91114253d5
+_C2 = 0x4cf5ad432745937f
+_BLOCK = struct.Struct('<Q')
+
+
+def _encode(key: str) -> bytes:
+    """
+    Helper method that returns the UTF-8 bytes of a key, keeping lone surrogates instead of failing on them
+    """
+    return key.encode('utf-8', 'surrogatepass')
+
+
+def mix64(code: int) -> int:
+    """
+    This method scrambles the bits of a 64-bit integer (the MurmurHash3 finalizer), so that every
+    input bit affects every output bit
+    """
+    code &= MASK_64
+    code ^= code >> 33
+    code = (code * 0xff51afd7ed558ccd) & MASK_64
+    code ^= code >> 33
+    code = (code * 0xc4ceb9fe1a85ec53) & MASK_64
+    code ^= code >> 33
+    return code
+
+
+def fnv1a(key: str) -> int:
+    """
+    This method returns the 64-bit FNV-1a hash of the key's UTF-8 bytes
+    """
+    code = FNV_OFFSET
+    for byte in _encode(key):
+        code = ((code ^ byte) * FNV_PRIME) & MASK_64
+    return code
+
+
+def _murmur(data: bytes, seed: int) -> int:
+    """
+    Helper method that hashes bytes eight at a time with the MurmurHash3 x64 block mixing, then
+    finalizes with mix64
+    """
+    code = seed & MASK_64
+    length = len(data)
+    tail = length % 8
+
+    for (block,) in _BLOCK.iter_unpack(data[:length - tail]):
+        block = (block * _C1) & MASK_64
+        block = ((block << 31) | (block >> 33)) & MASK_64
+        code ^= (block * _C2) & MASK_64
+        code = ((code << 27) | (code >> 37)) & MASK_64
+        code = (code * 5 + 0x52dce729) & MASK_64
+
+    if tail:
+        # The last 1-7 bytes are mixed in as one short block
+        block = (int.from_bytes(data[length - tail:], 'little') * _C1) & MASK_64
+        block = ((block << 31) | (block >> 33)) & MASK_64
+        code ^= (block * _C2) & MASK_64
+
+    return mix64(code ^ length)
+
+
+def murmur_mix(key: str) -> int:
+    """
+    This method returns a murmur-style 64-bit hash of the key's UTF-8 bytes
+    """
+    return _murmur(_encode(key), 0)
+
+
+def builtin_hash(key: str) -> int:
+    """
+    This method adapts Python's built-in hash() to a non-negative 64-bit integer
+    String hashes are randomized per process unless PYTHONHASHSEED is set, so they must not be
+    saved to disk or compared across processes
+    """
+    return hash(key) & MASK_64
+
+
+def seeded_hash(seed: int) -> callable:
+    """
+    This method returns a murmur-style hash function whose output depends on the given seed
+    Different seeds give independent hash functions for the same keys
+    """
+    def function(key: str) -> int:
+        return _murmur(_encode(key), seed)
+
+    function.__name__ = f"seeded_hash_{seed}"
+    return function
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    from a6_include import hash_function_1, hash_function_2
+
+    print("\nHash functions - anagram example 1")
+    print("----------------------------------")
+    for function in (hash_function_1, hash_function_2, fnv1a, murmur_mix, seeded_hash(1), seeded_hash(2)):
+        print(f"{function.__name__:<16} str12: {function('str12'):>20}  str21: {function('str21'):>20}")
@@ -0,0 +1,331 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Open Addressing (Cuckoo)
+# Due Date: December 8, 2023
+# Description: This program implements an Open Addressing HashMap that uses bucketized cuckoo hashing,
+# so every key lives in one of two buckets (or a small stash) and a lookup never probes further
+
+import random
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+from hash_functions import seeded_hash
+from hash_map_snapshot import write_snapshot
+from hash_map_policy import GrowthPolicy
+import hash_map_oa
+
+
+class HashMap(hash_map_oa.HashMap):
+    """
+    Open Addressing HashMap with bucketized cuckoo hashing
+    It shares the public API of hash_map_oa.HashMap; the table is a row of SLOTS-slot buckets, its
+    capacity counts slots, and removed entries are never left as tombstones
+
+    Each key has two candidate buckets, taken from the low and high halves of one seeded 64-bit hash of
+    the key, and a put that finds both full moves a resident to its other bucket. An entry still
+    without a slot after _MAX_KICKS moves goes to the stash; when the stash is full the table grows
+    """
+
+    # Slots per bucket, and entries that may wait in the stash
+    SLOTS = 4
+    STASH = 4
+
+    # Two 4-slot buckets per key keep insertions short well past the 0.5 used by quadratic probing
+    _MAX_LOAD = 0.9
+    _DEFAULT_POLICY = GrowthPolicy(_MAX_LOAD)
+    _MAX_KICKS = 250
+
+    def __init__(self, capacity: int, function, seed: int = 0, instrument: bool = False) -> None:
+        """
+        Initialize new HashMap that uses
+        cuckoo hashing for collision resolution
+
+        The buckets come from seeded_hash(seed) rather than from function: hash_function_1 and
+        hash_function_2 give anagrams the same code, and no seed applied to a shared code can send
+        such keys to different buckets. function is only used by save, whose snapshots are read with it
+
+        instrument turns on histograms of the buckets (and stash) each operation looks at, read with stats()
+        """
+        self._cuckoo_hash = seeded_hash(seed)
+        self._random = random.Random(seed)
+
+        # Buckets come from their own mask, the shared power-of-two slot mask is not used
+        self._power_of_two = False
+        self._mask = None
+        self._allocate(self._round_capacity(capacity))
+
+        self._init_state(function, self._DEFAULT_POLICY, instrument)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as hash_map_oa.HashMap, followed by the stash
+        """
+        out = super().__str__()
+        if self._stash:
+            out += 'stash: ' + ', '.join(str(entry) for entry in self._stash) + '\n'
+        return out
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Helper method that returns the capacity the table is built with: a power of two number of buckets
+        """
+        bucket_count = -(-max(capacity, 1) // self.SLOTS)
+        return self.SLOTS << (bucket_count - 1).bit_length()
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper method that creates an empty table and stash for the given (rounded) capacity
+        """
+        self._capacity = capacity
+        self._bucket_mask = capacity // self.SLOTS - 1
+        self._buckets = DynamicArray([None] * capacity)
+        self._stash = []
+
+    def _candidates(self, code: int) -> tuple:
+        """
+        Helper method that returns the first slot of both candidate buckets of a hash code
+        """
+        return (code & self._bucket_mask) * self.SLOTS, ((code >> 32) & self._bucket_mask) * self.SLOTS
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method updates the key/value pair in the hash map
+
+        If the key exists, the associated value is replaced with the new value
+        If the key does not exist, a new key/value pair is added
+
+        The table's capacity is doubled if the current load factor is >= 0.9
+        """
+        code = self._cuckoo_hash(key)
+        entry = self._find(key, code, 'put')
+        if entry is not None:
+            # Key already exists, update the value
+            entry.value = value
+            return
+
+        if self._size / self._capacity >= self._MAX_LOAD:
+            self._resize_internal(self._capacity * 2)
+
+        homeless = self._place(HashEntry(key, value, code))
+        if homeless is not None:
+            self._resize_internal(self._capacity * 2, homeless)
+        self._size += 1
+        self._version += 1
+
+    def _place(self, entry: HashEntry):
+        """
+        Helper method that places an entry whose key is not in the hash map, moving residents to their
+        other bucket as needed
+        Returns None once every entry has a slot, or the entry left over when the stash is full
+        """
+        buckets, slots = self._buckets, self.SLOTS
+        evicted_from = -1
+
+        for _ in range(self._MAX_KICKS):
+            first, second = self._candidates(entry.hash)
+            for start in (first, second):
+                for index in range(start, start + slots):
+                    if buckets[index] is None:
+                        buckets[index] = entry
+                        return None
+
+            # Both buckets are full: move a random resident out of the bucket the entry did not just
+            # leave, and carry that resident to its other bucket
+            if evicted_from == first:
+                start = second
+            elif evicted_from == second:
+                start = first
+            else:
+                start = first if self._random.random() < 0.5 else second
+            index = start + self._random.randrange(slots)
+            buckets[index], entry = entry, buckets[index]
+            evicted_from = start
+
+        if len(self._stash) < self.STASH:
+            self._stash.append(entry)
+            return None
+        return entry
+
+    def _find(self, key: str, code: int, operation: str):
+        """
+        Helper method that returns the entry of the given key, or None if it is not in the hash map
+        It looks at the key's two buckets and then the stash, and at nothing else
+        """
+        buckets = self._buckets
+        looked_at = 0
+        found = None
+
+        for start in self._candidates(code):
+            looked_at += 1
+            for index in range(start, start + self.SLOTS):
+                entry = buckets[index]
+                if entry is not None and entry.hash == code and entry.key == key:
+                    found = entry
+                    break
+            if found is not None:
+                break
+        else:
+            if self._stash:
+                looked_at += 1
+                for entry in self._stash:
+                    if entry.hash == code and entry.key == key:
+                        found = entry
+                        break
+
+        if self._stats is not None:
+            self._stats.record(operation, looked_at)
+        return found
+
+    def _resize_internal(self, new_capacity: int, homeless: HashEntry = None) -> None:
+        """
+        Internal method to resize the hash map
+        Reinsert all existing entries (and an entry still waiting for a slot) into the new table using
+        their cached hash codes, doubling the capacity again in the rare case they do not fit
+        """
+        entries = list(self._entries())
+        if homeless is not None:
+            entries.append(homeless)
+
+        capacity = self._round_capacity(new_capacity)
+        while True:
+            self._allocate(capacity)
+            if all(self._place(entry) is None for entry in entries):
+                break
+            capacity *= 2
+        self._version += 1
+
+    def _entries(self):
+        """
+        Helper generator that yields the entries of the table in slot order, then those of the stash
+        """
+        buckets = self._buckets
+        for index in range(self._capacity):
+            entry = buckets[index]
+            if entry is not None:
+                yield entry
+        yield from self._stash
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key
+        """
+        entry = self._find(key, self._cuckoo_hash(key), 'get')
+        return entry.value if entry is not None else None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        return self._find(key, self._cuckoo_hash(key), 'contains_key') is not None
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map
+        The freed slot is handed to a stashed entry that belongs to its bucket, if there is one
+        """
+        code = self._cuckoo_hash(key)
+        entry = self._find(key, code, 'remove')
+        if entry is None:
+            return
+
+        self._size -= 1
+        self._version += 1
+        if entry in self._stash:
+            self._stash.remove(entry)
+            return
+
+        for start in self._candidates(code):
+            for index in range(start, start + self.SLOTS):
+                if self._buckets[index] is entry:
+                    self._buckets[index] = None
+                    self._unstash(start, index)
+                    return
+
+    def _unstash(self, start: int, index: int) -> None:
+        """
+        Helper method that moves the first stashed entry whose candidate buckets include the bucket
+        starting at start into the free slot at index
+        """
+        for position, entry in enumerate(self._stash):
+            if start in self._candidates(entry.hash):
+                self._buckets[index] = entry
+                del self._stash[position]
+                return
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array where each index contains a tuple of a key/value pair stored in the hash map
+        """
+        key_value_pairs = DynamicArray()
+        for entry in self._entries():
+            key_value_pairs.append((entry.key, entry.value))
+        return key_value_pairs
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._version += 1
+
+    def save(self, path: str) -> None:
+        """
+        This method writes the hash map to a snapshot file that open_mapped can open without rebuilding it
+        Keys must be strings; values are stored pickled
+        """
+        # Snapshots place keys with the map's hash function and quadratic probing over a prime capacity
+        entries = [(self._hash_function(entry.key), entry.key, entry.value) for entry in self._entries()]
+        write_snapshot(path, self._next_prime(2 * self._size + 1), self._hash_function, entries)
+
+    def _live_entries(self):
+        """
+        Helper generator that yields the entries of the table and then the stash without copying them
+        A put of a new key, a remove or a resize between two steps raises RuntimeError
+        """
+        version = self._version
+        for entry in self._entries():
+            yield entry
+            if self._version != version:
+                raise RuntimeError("HashMap changed during iteration")
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nCuckoo - put example 1")
+    print("----------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nCuckoo - contains_key example 1")
+    print("-------------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key))
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nCuckoo - remove example 1")
+    print("-------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
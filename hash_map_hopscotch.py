@@ -0,0 +1,352 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Open Addressing (Hopscotch)
+# Due Date: December 8, 2023
+# Description: This program implements an Open Addressing HashMap that uses hopscotch hashing, so every
+# key stays within a fixed neighborhood of its home slot and lookups only look at that neighborhood
+
+from array import array
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+from hash_functions import mix64
+from hash_map_snapshot import write_snapshot
+from hash_map_policy import GrowthPolicy
+import hash_map_oa
+
+
+class HashMap(hash_map_oa.HashMap):
+    """
+    Open Addressing HashMap with hopscotch hashing
+    It shares the public API of hash_map_oa.HashMap; removed entries are never left as tombstones
+
+    Every key lives in one of the NEIGHBORHOOD slots starting at its home slot, taken from its mixed hash
+    code. Each home slot keeps a hop bitmap, bit i set meaning the slot i places after it holds one of its
+    keys, so a lookup only compares the keys the bitmap points at. A put takes the closest empty slot and,
+    while it is outside the neighborhood, swaps it backwards with an entry that can move into it without
+    leaving its own. Keys of a home slot whose whole neighborhood is its own wait in that slot's overflow
+    """
+
+    # Slots in a neighborhood, one bit of a hop bitmap each
+    NEIGHBORHOOD = 64
+    _FULL_HOP = (1 << NEIGHBORHOOD) - 1
+
+    # Neighborhoods of 64 slots keep insertions short well past the 0.5 used by quadratic probing
+    _MAX_LOAD = 0.9
+    _DEFAULT_POLICY = GrowthPolicy(_MAX_LOAD)
+
+    def __init__(self, capacity: int, function, instrument: bool = False) -> None:
+        """
+        Initialize new HashMap that uses
+        hopscotch hashing for collision resolution
+
+        instrument turns on histograms of the slots each operation compares, read with stats()
+        """
+        # capacity must be a prime number
+        self._power_of_two = False
+        self._mask = None
+        self._allocate(self._next_prime(capacity))
+
+        self._init_state(function, self._DEFAULT_POLICY, instrument)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as hash_map_oa.HashMap, followed by the overflow
+        """
+        out = super().__str__()
+        if self._overflow:
+            out += 'overflow: ' + ', '.join(str(entry) for entry in self._overflow_entries()) + '\n'
+        return out
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper method that creates an empty table, its hop bitmaps and an empty overflow
+        """
+        self._capacity = capacity
+        self._buckets = DynamicArray([None] * capacity)
+        self._hops = array('Q', bytes(8 * capacity))
+
+        # Lists of the keys that found no slot in their neighborhood, by home slot. With mixed codes a
+        # neighborhood only fills up at a low load factor when a hash function gives many keys equal codes
+        # (such as anagrams with hash_function_1), and a lookup only scans the list of its own home slot
+        self._overflow = {}
+        self._overflow_size = 0
+
+    def _home(self, code: int) -> int:
+        """
+        Helper method that returns the home slot of a hash code, mixed so that nearby codes spread out
+        """
+        return mix64(code) % self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method updates the key/value pair in the hash map
+
+        If the key exists, the associated value is replaced with the new value
+        If the key does not exist, a new key/value pair is added
+
+        The table's capacity is doubled if the current load factor is >= 0.9
+        """
+        code = self._hash_function(key)
+        home = self._home(code)
+        index = self._find(key, code, home, 'put')
+        if index is not None:
+            # Key already exists, update the value
+            self._entry_at(home, index).value = value
+            return
+
+        if self._size / self._capacity >= self._MAX_LOAD:
+            self._resize_internal(self._capacity * 2)
+            home = self._home(code)
+
+        entry = HashEntry(key, value, code)
+        while not self._place(entry, home):
+            # A neighborhood that holds only keys of this home slot would stay full at any capacity, and one
+            # that is full at a low load factor is full of keys with equal codes, which growing rarely separates
+            if self._hops[home] == self._FULL_HOP or 2 * (self._size - self._overflow_size) < self._capacity:
+                self._overflow.setdefault(home, []).append(entry)
+                self._overflow_size += 1
+                break
+            self._resize_internal(self._capacity * 2)
+            home = self._home(code)
+
+        self._size += 1
+        self._version += 1
+
+    def _place(self, entry: HashEntry, home: int) -> bool:
+        """
+        Helper method that places an entry whose key is not in the hash map within the neighborhood of
+        its home slot
+        Returns False, leaving the table unchanged apart from moved entries, if there is no room
+        """
+        capacity, buckets = self._capacity, self._buckets
+
+        # Find the closest empty slot with linear probing
+        distance = 0
+        while distance < capacity and buckets[(home + distance) % capacity] is not None:
+            distance += 1
+        if distance == capacity:
+            return False
+
+        # Move the empty slot back until it is inside the home slot's neighborhood
+        while distance >= self.NEIGHBORHOOD:
+            moved = self._hop_back((home + distance) % capacity)
+            if not moved:
+                return False
+            distance -= moved
+
+        buckets[(home + distance) % capacity] = entry
+        self._hops[home] |= 1 << distance
+        return True
+
+    def _hop_back(self, free: int) -> int:
+        """
+        Helper method that moves an entry from before the empty slot at free into it, choosing the
+        entry furthest back whose neighborhood still includes free
+        Returns how many slots the empty slot moved back, or 0 if no entry could move
+        """
+        capacity, buckets, hops = self._capacity, self._buckets, self._hops
+
+        for offset in range(self.NEIGHBORHOOD - 1, 0, -1):
+            home = (free - offset) % capacity
+
+            # Entries of this home slot placed before free, the earliest one moves the furthest
+            movable = hops[home] & ((1 << offset) - 1)
+            if movable:
+                hop = (movable & -movable).bit_length() - 1
+                source = (home + hop) % capacity
+                buckets[free], buckets[source] = buckets[source], None
+                hops[home] = (hops[home] & ~(1 << hop)) | (1 << offset)
+                return offset - hop
+
+        return 0
+
+    def _find(self, key: str, code: int, home: int, operation: str):
+        """
+        Helper method that returns the slot of the given key, -1 - i for position i of its home slot's
+        overflow list, or None if it is not in the hash map
+        Only the slots set in the home slot's hop bitmap, and that home slot's overflow, are compared
+        """
+        capacity, buckets = self._capacity, self._buckets
+        hop = self._hops[home]
+        compared = 0
+        found = None
+
+        while hop:
+            index = (home + (hop & -hop).bit_length() - 1) % capacity
+            compared += 1
+            entry = buckets[index]
+            if entry.hash == code and entry.key == key:
+                found = index
+                break
+            hop &= hop - 1
+        else:
+            for position, entry in enumerate(self._overflow.get(home, ())):
+                compared += 1
+                if entry.hash == code and entry.key == key:
+                    found = -1 - position
+                    break
+
+        if self._stats is not None:
+            self._stats.record(operation, compared)
+        return found
+
+    def _entry_at(self, home: int, index: int) -> HashEntry:
+        """
+        Helper method that returns the entry _find located, in the table or in the home slot's overflow
+        """
+        return self._buckets[index] if index >= 0 else self._overflow[home][-1 - index]
+
+    def _resize_internal(self, new_capacity: int) -> None:
+        """
+        Internal method to resize the hash map
+        Reinsert all existing entries into the new table using their cached hash codes
+        """
+        entries = list(self._entries())
+
+        self._allocate(self._next_prime(new_capacity))
+        for entry in entries:
+            home = self._home(entry.hash)
+            if not self._place(entry, home):
+                self._overflow.setdefault(home, []).append(entry)
+                self._overflow_size += 1
+        self._version += 1
+
+    def _entries(self):
+        """
+        Helper generator that yields the entries of the table in slot order, then those of the overflow
+        """
+        buckets = self._buckets
+        for index in range(self._capacity):
+            entry = buckets[index]
+            if entry is not None:
+                yield entry
+        yield from self._overflow_entries()
+
+    def _overflow_entries(self):
+        """
+        Helper generator that yields the entries of every overflow list
+        """
+        for entries in self._overflow.values():
+            yield from entries
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key
+        """
+        code = self._hash_function(key)
+        home = self._home(code)
+        index = self._find(key, code, home, 'get')
+        return self._entry_at(home, index).value if index is not None else None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        code = self._hash_function(key)
+        return self._find(key, code, self._home(code), 'contains_key') is not None
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map
+        Its slot is emptied and its bit cleared, so no tombstone is left behind, unless a key of the same
+        home slot waits in the overflow and takes the slot over
+        """
+        code = self._hash_function(key)
+        home = self._home(code)
+        index = self._find(key, code, home, 'remove')
+        if index is None:
+            return
+
+        overflow = self._overflow.get(home)
+        if index < 0:
+            del overflow[-1 - index]
+            self._overflow_size -= 1
+        elif overflow:
+            self._buckets[index] = overflow.pop()
+            self._overflow_size -= 1
+        else:
+            self._buckets[index] = None
+            self._hops[home] &= ~(1 << ((index - home) % self._capacity))
+        if overflow is not None and not overflow:
+            del self._overflow[home]
+        self._size -= 1
+        self._version += 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array where each index contains a tuple of a key/value pair stored in the hash map
+        """
+        key_value_pairs = DynamicArray()
+        for entry in self._entries():
+            key_value_pairs.append((entry.key, entry.value))
+        return key_value_pairs
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._version += 1
+
+    def save(self, path: str) -> None:
+        """
+        This method writes the hash map to a snapshot file that open_mapped can open without rebuilding it
+        Keys must be strings; values are stored pickled
+        """
+        # Snapshots use quadratic probing, which needs a prime capacity more than twice the size
+        entries = [(entry.hash, entry.key, entry.value) for entry in self._entries()]
+        write_snapshot(path, self._next_prime(2 * self._size + 1), self._hash_function, entries)
+
+    def _live_entries(self):
+        """
+        Helper generator that yields the entries of the table and then the overflow list without copying them
+        A put of a new key, a remove or a resize between two steps raises RuntimeError
+        """
+        version = self._version
+        for entry in self._entries():
+            yield entry
+            if self._version != version:
+                raise RuntimeError("HashMap changed during iteration")
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nHopscotch - put example 1")
+    print("-------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nHopscotch - contains_key example 1")
+    print("----------------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key))
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nHopscotch - remove example 1")
+    print("----------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
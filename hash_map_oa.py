@@ -7,24 +7,78 @@
 
 from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
                         hash_function_1, hash_function_2)
+from hash_functions import mix64
+from hash_primes import is_prime, next_prime
+from hash_map_policy import GrowthPolicy
+from hash_map_snapshot import MappedHashMap, open_mapped, write_snapshot
+from hash_map_stats import OperationStats
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    # Policy of a map created without one: double the capacity once the load factor reaches 0.5
+    _DEFAULT_POLICY = GrowthPolicy(0.5)
+
+    def __init__(self, capacity: int, function, instrument: bool = False,
+                 power_of_two: bool = False, shrink: bool = False, policy: GrowthPolicy = None) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        instrument turns on probe count histograms, read with stats()
+
+        power_of_two keeps the capacity a power of two instead of a prime: home slots come from a
+        bitmask of the mixed hash code, and collisions use triangular probing
+
+        shrink turns on automatic shrinking after removals, never below the initial capacity
+
+        policy is the GrowthPolicy (or AdaptivePolicy) that sets the maximum load factor, growth factor
+        and minimum capacity, instead of doubling at a load factor of 0.5
+        Quadratic probing only reaches half of a prime table, so a policy's load factor may go above 0.5
+        only in power-of-two mode, and must stay below 1.0 there
         """
+        policy = policy if policy is not None else self._DEFAULT_POLICY
+        if not power_of_two and policy.load_limit > 0.5:
+            raise ValueError("quadratic probing needs a load factor of at most 0.5, use power_of_two=True")
+        if policy.load_limit >= 1.0:
+            raise ValueError("the policy's load factor must stay below 1.0")
+        if policy.min_capacity is not None:
+            capacity = max(capacity, policy.min_capacity)
+
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number, or a power of two with its bitmask
+        self._power_of_two = power_of_two
+        self._capacity = self._round_capacity(capacity)
+        self._mask = self._capacity - 1 if power_of_two else None
         for _ in range(self._capacity):
             self._buckets.append(None)
 
+        self._init_state(function, policy, instrument, shrink)
+
+    def _init_state(self, function, policy: GrowthPolicy, instrument: bool, shrink: bool = False) -> None:
+        """
+        Helper method that sets up the state every open addressing map shares once its table is built:
+        the hash function, size and tombstone counts, growth policy, shrinking, version and histograms
+        """
         self._hash_function = function
         self._size = 0
+        self._tombstones = 0
+        self._policy = policy
+
+        # Automatic shrinking, which never goes below the policy's minimum (or else the initial) capacity
+        self._shrink = shrink
+        self._min_capacity = self._capacity
+        if policy.min_capacity is not None:
+            self._min_capacity = self._round_capacity(policy.min_capacity)
+
+        # Probe counts are only reported to adaptive policies
+        self._observe = policy.observe if policy.adaptive else None
+
+        # Changed by every insert, removal and rebuild, so iterators can detect a changed map
+        self._version = 0
+
+        # Probe count histograms, None unless instrumentation is on
+        self._stats = OperationStats() if instrument else None
 
     def __str__(self) -> str:
         """
@@ -38,36 +92,36 @@ class HashMap:
 
     def _next_prime(self, capacity: int) -> int:
         """
-        Increment from given number to find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Find the closest prime number from the given number in the shared prime table
         """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
+        return next_prime(capacity)
 
     @staticmethod
     def _is_prime(capacity: int) -> bool:
         """
         Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity == 2 or capacity == 3:
-            return True
+        return is_prime(capacity)
 
-        if capacity == 1 or capacity % 2 == 0:
-            return False
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Helper method that returns the capacity the table is built with: the next prime, or the next
+        power of two in power-of-two mode
+        """
+        if self._power_of_two:
+            return 1 << max(0, capacity - 1).bit_length()
+        return self._next_prime(capacity)
 
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
+    def _probe(self, home_index: int, index: int, probe_count: int) -> int:
+        """
+        Helper method that returns the slot of the given probe, one past the slot at index
+        """
+        if self._mask is None:
+            # Quadratic probing
+            return (home_index + probe_count ** 2) % self._capacity
 
-        return True
+        # Triangular probing (offsets 0, 1, 3, 6, ...) visits every slot of a power-of-two table
+        return (index + probe_count) & self._mask
 
     def get_size(self) -> int:
         """
@@ -92,46 +146,103 @@ class HashMap:
         If the key exists, the associated value is replaced with the new value
         If the key does not exist, a new key/value pair is added
 
-        The table's capacity is doubled if the current load factor is >= 0.5
+        The table's capacity is grown by the policy's growth factor (doubled by default) if the
+        current load factor is >= the policy's maximum load factor (0.5 by default)
         """
-        # Check if resizing is needed
-        load_factor = self._size / self._capacity
-        if load_factor >= 0.5:
-            self._resize_internal(self._capacity * 2)
-
-        # Calculate and retrieve the index to access the appropriate linked list
-        index = self._hash_function(key) % self._capacity
+        # Hash the key once and calculate its home index
+        code = self._hash_function(key)
+        index = code % self._capacity if self._mask is None else mix64(code) & self._mask
 
         # Quadratic probing to handle collisions
         current_index = index
         probe_count = 0
+        free_index = -1
 
         while probe_count < self._capacity:
             entry = self._buckets[current_index]
 
-            if entry is None or entry.is_tombstone:
-                # Found an empty slot or a tombstone, insert the new entry
-                self._buckets[current_index] = HashEntry(key, value)
-                self._size += 1
-                return
+            if entry is None:
+                # Found an empty slot, the key is not in the hash map
+                break
+
+            elif entry.is_tombstone:
+                # Remember the first tombstone, but keep probing in case the key is further along
+                if free_index < 0:
+                    free_index = current_index
 
-            elif entry.key == key:
+            elif entry.hash == code and entry.key == key:
                 # Key already exists, update the value
                 entry.value = value
+                if self._stats is not None:
+                    self._stats.record('put', probe_count + 1)
+                if self._observe is not None:
+                    self._observe(probe_count + 1)
                 return
 
-            # Quadratic probing: increment the probe count and recalculate index
+            # Increment the probe count and recalculate index
             probe_count += 1
-            current_index = (index + probe_count ** 2) % self._capacity
+            current_index = self._probe(index, current_index, probe_count)
+
+        if self._stats is not None:
+            self._stats.record('put', min(probe_count + 1, self._capacity))
+        if self._observe is not None:
+            self._observe(min(probe_count + 1, self._capacity))
+
+        # The key is new, so check if resizing (or compacting) is needed before it is added
+        buckets = self._buckets
+        if self._size / self._capacity >= self._policy.max_load:
+            self._resize_internal(self._grown_capacity(self._capacity, self._size + 1))
+        else:
+            self._compact_if_needed()
+
+        if self._buckets is not buckets:
+            # The rebuilt table has no tombstones, take the first empty slot of the key's probe sequence
+            free_index = self._empty_slot(code)
+        elif free_index >= 0:
+            # Reuse the first tombstone on the probe path
+            self._tombstones -= 1
+        elif probe_count < self._capacity:
+            free_index = current_index
+
+        if free_index < 0:
+            # If we reach here, it means we couldn't find an empty slot or tombstone after probing
+            raise DynamicArrayException("HashMap is full")
+
+        # Insert the new entry with its cached hash code
+        self._buckets[free_index] = HashEntry(key, value, code)
+        self._size += 1
+        self._version += 1
+
+    def _empty_slot(self, code: int) -> int:
+        """
+        Helper method that returns the first empty slot of the probe sequence of the given hash code,
+        or -1 if the sequence runs out of slots
+        """
+        home_index = index = code % self._capacity if self._mask is None else mix64(code) & self._mask
+        probe_count = 0
+
+        while self._buckets[index] is not None:
+            probe_count += 1
+            if probe_count == self._capacity:
+                return -1
+            index = self._probe(home_index, index, probe_count)
 
-        # If we reach here, it means we couldn't find an empty slot or tombstone after probing
-        raise DynamicArrayException("HashMap is full")
+        return index
 
     def _resize(self) -> None:
         """
-        Helper method that resizes the hash map to double its current capacity if the current load factor is >= 0.5
+        Helper method that grows the hash map's capacity by one step of its policy
+        """
+        self._resize_internal(self._policy.grown_capacity(self._capacity))
+
+    def _grown_capacity(self, capacity: int, size: int) -> int:
+        """
+        Helper method that grows the capacity by the policy's growth factor until the put of the
+        size-th key would no longer grow it
         """
-        self._resize_internal(self._capacity * 2)
+        while (size - 1) / capacity >= self._policy.max_load:
+            capacity = self._round_capacity(self._policy.grown_capacity(capacity))
+        return capacity
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -148,40 +259,83 @@ class HashMap:
         Internal method to resize the hash map
         Rehash all existing entries to the new table
         """
-        # Find the next prime number for the new capacity
-        new_capacity = self._next_prime(new_capacity)
+        old_buckets, old_capacity = self._buckets, self._capacity
+
+        # Find the next prime number (or power of two) for the new capacity
+        new_capacity = self._round_capacity(new_capacity)
+        while not self._rebuild(old_buckets, old_capacity, new_capacity):
+            # Quadratic probing reaches only about half of a prime table's slots, so a table that
+            # resize_table made more than half full can leave an entry without a reachable slot
+            new_capacity = self._round_capacity(2 * new_capacity)
 
-        # Create a new dynamic array with the updated capacity
-        new_buckets = DynamicArray()
-        for _ in range(new_capacity):
-            new_buckets.append(None)
+    def _rebuild(self, old_buckets: DynamicArray, old_capacity: int, new_capacity: int) -> bool:
+        """
+        Helper method that moves the live entries of the old buckets into a new table of the given
+        capacity, returning False if an entry's probe sequence runs out of slots
+        """
+        self._capacity = new_capacity
+        if self._mask is not None:
+            self._mask = new_capacity - 1
+
+        # Create a new dynamic array with the updated capacity, which holds no tombstones
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._tombstones = 0
+        self._version += 1
 
         index = 0
 
-        # Iterate through existing entries in the current dynamic array
-        while index < self._capacity:
-            entry = self._buckets[index]
+        # Iterate through existing entries in the old dynamic array
+        while index < old_capacity:
+            entry = old_buckets[index]
 
-            # Rehash and insert non-empty, non-tombstone entries into the new array
+            # Move non-empty, non-tombstone entries into the new array using their cached hash codes
             if entry and not entry.is_tombstone:
-                new_index = self._hash_function(entry.key) % new_capacity
+                if self._mask is None:
+                    home_index = new_index = entry.hash % new_capacity
+                else:
+                    home_index = new_index = mix64(entry.hash) & self._mask
                 new_probe_count = 0
 
-                # Quadratic probing to handle collisions
-                while True:
-                    new_index = (new_index + new_probe_count ** 2) % new_capacity
-
-                    if new_buckets[new_index] is None or new_buckets[new_index].is_tombstone:
-                        new_buckets[new_index] = entry
-                        break
-
+                # Follow the same probe sequence as put to handle collisions
+                while self._buckets[new_index] is not None:
                     new_probe_count += 1
+                    if new_probe_count == new_capacity:
+                        return False
+                    new_index = self._probe(home_index, new_index, new_probe_count)
+
+                self._buckets[new_index] = entry
 
             index += 1
 
-        # Update the hash map's capacity and dynamic array
-        self._capacity = new_capacity
-        self._buckets = new_buckets
+        return True
+
+    def _compact_if_needed(self) -> None:
+        """
+        Helper method that rebuilds the table at the same capacity when live entries plus
+        tombstones cross the compaction threshold, so probes stop walking long tombstone runs
+        The threshold is halfway between the policy's maximum load factor and a full table (0.75 by
+        default); if an adaptive policy has lowered the maximum below the live entries, the rebuild grows
+        """
+        if (self._size + self._tombstones) / self._capacity >= (1 + self._policy.max_load) / 2:
+            self._resize_internal(self._grown_capacity(self._capacity, self._size + 1))
+
+    def _shrink_if_needed(self) -> None:
+        """
+        Helper method that rebuilds the table at a smaller capacity once the load factor falls below
+        the low-water mark, if shrinking is on
+        """
+        if not self._shrink or self._size >= self._policy.shrink_load * self._capacity:
+            return
+
+        capacity = self._round_capacity(max(self._min_capacity, self._policy.shrunk_capacity(self._size)))
+        if capacity < self._capacity:
+            self._resize_internal(capacity)
+
+    def tombstone_buckets(self) -> int:
+        """
+        This method returns the number of tombstone buckets in the hash table
+        """
+        return self._tombstones
 
     def table_load(self) -> float:
         """
@@ -214,83 +368,120 @@ class HashMap:
         This method returns the value associated with the given key
         """
         # Calculate the initial index using the hash function and capacity
-        index = self._hash_function(key) % self._capacity
+        code = self._hash_function(key)
+        home_index = index = code % self._capacity if self._mask is None else mix64(code) & self._mask
         probe_count = 0
+        value = None
 
         while probe_count < self._capacity:
-            # Iterate through the hash map using quadratic probing
+            # Iterate through the hash map along the probe sequence
             entry = self._buckets[index]
 
             if entry is None:
                 # Reached an empty slot, key is not in the hash map
-                return None
+                break
 
-            elif entry.key == key:
+            elif not entry.is_tombstone and entry.hash == code and entry.key == key:
                 # Found the key, return its associated value
-                return entry.value
+                value = entry.value
+                break
 
-            # Quadratic probing: increment the probe count and recalculate index
+            # Increment the probe count and move to the next slot
             probe_count += 1
-            index = (index + probe_count ** 2) % self._capacity
+            index = self._probe(home_index, index, probe_count)
 
-        # If the loop completes without finding the key, return None
-        return None
+        if self._stats is not None:
+            self._stats.record('get', min(probe_count + 1, self._capacity))
+        if self._observe is not None:
+            self._observe(min(probe_count + 1, self._capacity))
+
+        # If the loop completes without finding the key, value is still None
+        return value
 
     def contains_key(self, key: str) -> bool:
         """
         This method returns True if the given key is in the hash map, otherwise it returns False
         """
         # Calculate the initial index using the hash function and capacity
-        index = self._hash_function(key) % self._capacity
+        code = self._hash_function(key)
+        home_index = index = code % self._capacity if self._mask is None else mix64(code) & self._mask
         probe_count = 0
+        found = False
 
         while probe_count < self._capacity:
-            # Iterate through the hash map using quadratic probing
+            # Iterate through the hash map along the probe sequence
             entry = self._buckets[index]
 
             if entry is None:
                 # Reached an empty slot, key is not in the hash map
-                return False
+                break
 
-            elif entry.key == key:
+            elif not entry.is_tombstone and entry.hash == code and entry.key == key:
                 # Found the key
-                return True
+                found = True
+                break
 
-            # Quadratic probing: increment the probe count and recalculate index
+            # Increment the probe count and move to the next slot
             probe_count += 1
-            index = (index + probe_count ** 2) % self._capacity
+            index = self._probe(home_index, index, probe_count)
+
+        if self._stats is not None:
+            self._stats.record('contains_key', min(probe_count + 1, self._capacity))
+        if self._observe is not None:
+            self._observe(min(probe_count + 1, self._capacity))
 
-        # If the loop completes without finding the key, return None
-        return False
+        # If the loop completes without finding the key, found is still False
+        return found
 
     def remove(self, key: str) -> None:
         """
         This method removes the given key and its associated value from the hash map.
         """
         # Calculate the initial index using the hash function and capacity
-        index = self._hash_function(key) % self._capacity
+        code = self._hash_function(key)
+        home_index = index = code % self._capacity if self._mask is None else mix64(code) & self._mask
         probe_count = 0
 
         while probe_count < self._capacity:
-            # Iterate through the hash map using quadratic probing
+            # Iterate through the hash map along the probe sequence
             entry = self._buckets[index]
 
             if entry is None:
                 # Reached an empty slot, key is not in the hash map
-                return
+                break
 
-            elif entry.key == key:
+            elif not entry.is_tombstone and entry.hash == code and entry.key == key:
                 # Found the key, mark the entry as tombstone
                 entry.is_tombstone = True
                 self._size -= 1
-                return
+                self._tombstones += 1
+                self._version += 1
+                self._shrink_if_needed()
+                self._compact_if_needed()
+                break
 
-            # Quadratic probing: increment the probe count and recalculate index
+            # Increment the probe count and move to the next slot
             probe_count += 1
-            index = (index + probe_count ** 2) % self._capacity
+            index = self._probe(home_index, index, probe_count)
+
+        if self._stats is not None:
+            self._stats.record('remove', min(probe_count + 1, self._capacity))
+
+    def stats(self) -> dict:
+        """
+        This method returns the count, mean, p50, p99 and max probe count of each operation
+        """
+        if self._stats is None:
+            raise ValueError("instrumentation is off, create the HashMap with instrument=True")
+        return self._stats.summary()
 
-        # If the loop completes without finding the key, return None
-        return
+    def reset_stats(self) -> None:
+        """
+        This method clears the recorded probe counts
+        """
+        if self._stats is None:
+            raise ValueError("instrumentation is off, create the HashMap with instrument=True")
+        self._stats = OperationStats()
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -313,41 +504,78 @@ class HashMap:
     def clear(self) -> None:
         """
         This method clears the contents of the hash map
+        The buckets are replaced by one new array of the same capacity instead of being reset one by one
+        With shrinking on, the new array has the initial capacity
         """
-        for i in range(self._capacity):
-            # Set each bucket to None, effectively removing all key/value pairs
-            self._buckets[i] = None
+        if self._shrink and self._capacity > self._min_capacity:
+            self._capacity = self._min_capacity
+            if self._mask is not None:
+                self._mask = self._capacity - 1
+        self._buckets = DynamicArray([None] * self._capacity)
 
-        # Reset the size of the hash map to zero
+        # Reset the size of the hash map and its tombstone count to zero
         self._size = 0
+        self._tombstones = 0
+        self._version += 1
+
+    def save(self, path: str) -> None:
+        """
+        This method writes the hash map to a snapshot file that open_mapped can open without rebuilding it
+        Keys must be strings; values are stored pickled
+        """
+        # The snapshot keeps the map's capacity unless it is over half full (possible after resize_table)
+        # or a power of two, since snapshots always use quadratic probing over a prime capacity
+        capacity = self._capacity
+        if 2 * self._size >= capacity or self._power_of_two:
+            capacity = self._next_prime(max(capacity, 2 * self._size + 1))
+
+        entries = []
+        for index in range(self._capacity):
+            entry = self._buckets[index]
+            if entry and not entry.is_tombstone:
+                entries.append((entry.hash, entry.key, entry.value))
+
+        write_snapshot(path, capacity, self._hash_function, entries)
 
     def __iter__(self):
         """
-        This method enables the hash map to iterate across itself
+        This method enables the hash map to iterate across itself, yielding the HashEntry of every
+        key/value pair; every loop gets its own iterator, so nested loops do not interfere
         """
-        self.index = 0
-        return self
+        return self._live_entries()
 
-    def __next__(self):
+    def keys(self):
         """
-        This method will return the next item in the hash map, based on the current location of the iterator
+        This method returns an iterator over the keys of the hash map
         """
-        # Iterate through the buckets starting from the current index
-        while self.index < self._capacity:
-            # Get the entry at the current index
-            entry = self._buckets[self.index]
+        return (entry.key for entry in self._live_entries())
 
-            # Check if the entry is non-empty and not a tombstone
-            if entry and not entry.is_tombstone:
-                # Move the index to the next position before returning the entry
-                self.index += 1
-                return entry
+    def values(self):
+        """
+        This method returns an iterator over the values of the hash map
+        """
+        return (entry.value for entry in self._live_entries())
 
-            # Move to the next index in case of tombstone or empty entry
-            self.index += 1
+    def items(self):
+        """
+        This method returns an iterator over the (key, value) tuples of the hash map
+        """
+        return ((entry.key, entry.value) for entry in self._live_entries())
+
+    def _live_entries(self):
+        """
+        Helper generator that yields the live entries in bucket order without copying them
+        A put of a new key, a remove or a resize between two steps raises RuntimeError
+        """
+        version = self._version
+        buckets = self._buckets
+        for index in range(self._capacity):
+            entry = buckets[index]
+            if entry and not entry.is_tombstone:
+                yield entry
+                if self._version != version:
+                    raise RuntimeError("HashMap changed during iteration")
 
-        # If the loop completes without finding a valid entry, raise StopIteration
-        raise StopIteration
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
@@ -557,3 +785,17 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nsave(), open_mapped() example 1")
+    print("---------------------")
+    import os
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), 'map.a6oa')
+    m = HashMap(11, hash_function_2)
+    for i in range(20):
+        m.put('key' + str(i), i * 10)
+    m.remove('key3')
+    m.save(path)
+    with open_mapped(path) as mapped:
+        print(mapped.get_size(), mapped.get_capacity(), mapped.get('key7'), mapped.get('key3'),
+              mapped.contains_key('key19'), mapped.contains_key('key20'))
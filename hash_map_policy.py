@@ -0,0 +1,120 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Growth Policies
+# Due Date: December 8, 2023
+# Description: This program provides the growth policies that decide when a HashMap resizes and by how
+# much, either with a fixed maximum load factor or one that adapts to the probe counts (OA) or chain
+# lengths (SC) the map observes
+
+
+class GrowthPolicy:
+    """
+    Fixed resize thresholds of a HashMap
+    The table grows by growth_factor once the load factor reaches max_load, is never smaller than
+    min_capacity, and (with shrinking on) shrinks once the load factor falls below shrink_load
+    A fixed policy holds no state, so one instance can be shared by many maps
+    """
+
+    # Maps only report lengths to adaptive policies
+    adaptive = False
+
+    def __init__(self, max_load: float, growth_factor: float = 2.0, min_capacity: int = None) -> None:
+        """Initialize the policy, checking that its thresholds can work."""
+        if max_load <= 0:
+            raise ValueError("max_load must be positive")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+        if min_capacity is not None and min_capacity < 1:
+            raise ValueError("min_capacity must be at least 1")
+
+        self.max_load = max_load
+        self.growth_factor = growth_factor
+        self.min_capacity = min_capacity
+
+    def __repr__(self) -> str:
+        """Return the policy with its thresholds."""
+        return (f"{type(self).__name__}(max_load={self.max_load}, growth_factor={self.growth_factor}, "
+                f"min_capacity={self.min_capacity})")
+
+    @property
+    def load_limit(self) -> float:
+        """Return the highest max_load the policy can reach."""
+        return self.max_load
+
+    @property
+    def shrink_load(self) -> float:
+        """
+        Return the load factor below which a map with shrinking on shrinks
+        A shrink leaves the table one growth step below max_load and twice shrink_load, so the map
+        cannot flip between growing and shrinking
+        """
+        return self.max_load / (2 * self.growth_factor)
+
+    def grown_capacity(self, capacity: int) -> int:
+        """Return the capacity one growth step above the given one, before the map rounds it."""
+        return max(capacity + 1, int(capacity * self.growth_factor))
+
+    def shrunk_capacity(self, size: int) -> int:
+        """Return the capacity a shrink rebuilds a map of the given size at, before the map rounds it."""
+        return int(size * self.growth_factor / self.max_load) + 1
+
+    def observe(self, length: int) -> None:
+        """Record the probe count or chain length of one operation, a fixed policy ignores it."""
+
+
+class AdaptivePolicy(GrowthPolicy):
+    """
+    Growth policy whose max_load follows the probe counts (OA) or chain lengths (SC) the map observes
+    After every window operations, max_load is lowered by STEP when their mean length is above
+    target_length, trading memory for latency, and raised by STEP when the mean is below
+    target_length / STEP, never leaving [low_load, high_load]
+    Each map needs its own AdaptivePolicy, since the observed lengths are kept in the policy
+    """
+
+    adaptive = True
+
+    # Each adjustment multiplies or divides max_load by this factor
+    STEP = 1.25
+
+    def __init__(self, target_length: float, max_load: float, low_load: float, high_load: float,
+                 growth_factor: float = 2.0, min_capacity: int = None, window: int = 1024) -> None:
+        """Initialize the policy with max_load as its starting load factor."""
+        super().__init__(max_load, growth_factor, min_capacity)
+        if target_length < 1:
+            raise ValueError("target_length must be at least 1")
+        if not 0 < low_load <= max_load <= high_load:
+            raise ValueError("the load factors must satisfy 0 < low_load <= max_load <= high_load")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        self.target_length = target_length
+        self.low_load = low_load
+        self.high_load = high_load
+        self.window = window
+        self._total = 0
+        self._count = 0
+
+    def __repr__(self) -> str:
+        """Return the policy with its current and bounding thresholds."""
+        return (f"{type(self).__name__}(target_length={self.target_length}, max_load={self.max_load}, "
+                f"low_load={self.low_load}, high_load={self.high_load}, growth_factor={self.growth_factor}, "
+                f"min_capacity={self.min_capacity}, window={self.window})")
+
+    @property
+    def load_limit(self) -> float:
+        """Return the highest max_load the policy can reach."""
+        return self.high_load
+
+    def observe(self, length: int) -> None:
+        """Record the probe count or chain length of one operation, adjusting max_load after a full window."""
+        self._total += length
+        self._count += 1
+        if self._count < self.window:
+            return
+
+        mean = self._total / self._count
+        self._total = self._count = 0
+        if mean > self.target_length:
+            self.max_load = max(self.low_load, self.max_load / self.STEP)
+        elif mean * self.STEP < self.target_length:
+            self.max_load = min(self.high_load, self.max_load * self.STEP)
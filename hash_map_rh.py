@@ -0,0 +1,213 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Open Addressing (Robin Hood)
+# Due Date: December 8, 2023
+# Description: This program implements an Open Addressing HashMap that uses Robin Hood hashing
+# with linear probing, so it keeps probe lengths even and can run at a higher load factor
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+from hash_map_policy import GrowthPolicy
+import hash_map_oa
+
+
+class HashMap(hash_map_oa.HashMap):
+    """
+    Open Addressing HashMap with Robin Hood insertion and backward-shift deletion
+    It shares the public API of hash_map_oa.HashMap; entries are never left as tombstones
+    """
+
+    # Robin Hood keeps probe lengths short well past the 0.5 used by quadratic probing
+    _MAX_LOAD = 0.85
+    _DEFAULT_POLICY = GrowthPolicy(_MAX_LOAD)
+
+    def __init__(self, capacity: int, function, instrument: bool = False) -> None:
+        """
+        Initialize new HashMap that uses
+        Robin Hood linear probing for collision resolution
+
+        instrument turns on probe count histograms, read with stats()
+        """
+        # capacity must be a prime number
+        self._power_of_two = False
+        self._mask = None
+        self._capacity = self._next_prime(capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+
+        self._init_state(function, self._DEFAULT_POLICY, instrument)
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method updates the key/value pair in the hash map
+
+        If the key exists, the associated value is replaced with the new value
+        If the key does not exist, a new key/value pair is added
+
+        The table's capacity is doubled if the current load factor is >= 0.85
+        """
+        code = self._hash_function(key)
+        index = self._find(key, code, 'put')
+        if index >= 0:
+            # Key already exists, update the value
+            self._buckets[index].value = value
+            return
+
+        if self._size / self._capacity >= self._MAX_LOAD:
+            self._resize_internal(self._capacity * 2)
+
+        self._insert(HashEntry(key, value, code))
+        self._size += 1
+        self._version += 1
+
+    def _insert(self, entry: HashEntry) -> None:
+        """
+        Helper method that places an entry whose key is not in the hash map with Robin Hood linear probing
+        """
+        index = entry.hash % self._capacity
+        distance = 0
+
+        while True:
+            resident = self._buckets[index]
+
+            if resident is None:
+                # Found an empty slot, place the entry being carried
+                self._buckets[index] = entry
+                return
+
+            # Take the slot of any resident that is closer to its home slot than the carried entry
+            resident_distance = (index - resident.hash) % self._capacity
+            if resident_distance < distance:
+                self._buckets[index], entry = entry, resident
+                distance = resident_distance
+
+            index = (index + 1) % self._capacity
+            distance += 1
+
+    def _find(self, key: str, code: int, operation: str) -> int:
+        """
+        Helper method that returns the index of the given key, or -1 if it is not in the hash map
+        The search stops as soon as it passes a resident closer to home than the key would be
+        """
+        index = code % self._capacity
+        distance = 0
+        found = -1
+
+        while distance < self._capacity:
+            entry = self._buckets[index]
+
+            if entry is None or (index - entry.hash) % self._capacity < distance:
+                # The key would have displaced this resident, so it is not in the hash map
+                break
+
+            if entry.hash == code and entry.key == key:
+                found = index
+                break
+
+            index = (index + 1) % self._capacity
+            distance += 1
+
+        if self._stats is not None:
+            self._stats.record(operation, min(distance + 1, self._capacity))
+        return found
+
+    def _resize_internal(self, new_capacity: int) -> None:
+        """
+        Internal method to resize the hash map
+        Reinsert all existing entries into the new table using their cached hash codes
+        """
+        old_buckets, old_capacity = self._buckets, self._capacity
+
+        self._capacity = self._next_prime(new_capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._version += 1
+
+        for index in range(old_capacity):
+            entry = old_buckets[index]
+            if entry:
+                self._insert(entry)
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key
+        """
+        index = self._find(key, self._hash_function(key), 'get')
+        return self._buckets[index].value if index >= 0 else None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        return self._find(key, self._hash_function(key), 'contains_key') >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map
+        The entries after it are shifted back one slot, so no tombstone is left behind
+        """
+        index = self._find(key, self._hash_function(key), 'remove')
+        if index < 0:
+            return
+
+        self._buckets[index] = None
+        self._size -= 1
+        self._version += 1
+
+        # Shift back every following entry that is not already in its home slot
+        next_index = (index + 1) % self._capacity
+        while True:
+            entry = self._buckets[next_index]
+            if entry is None or entry.hash % self._capacity == next_index:
+                return
+
+            self._buckets[index] = entry
+            self._buckets[next_index] = None
+            index, next_index = next_index, (next_index + 1) % self._capacity
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map
+        """
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._size = 0
+        self._version += 1
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nRobin Hood - put example 1")
+    print("--------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nRobin Hood - contains_key example 1")
+    print("-----------------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key))
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nRobin Hood - remove example 1")
+    print("-----------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
@@ -5,34 +5,97 @@
 # Description: This program implements an optimized Hash Map class
 
 
+import math
+import multiprocessing
+import os
+
 from a6_include import (DynamicArray, LinkedList,
                         hash_function_1, hash_function_2)
+from hash_batch import as_list, hash_many
+from hash_functions import mix64
+from hash_primes import is_prime, next_prime
+from hash_map_policy import GrowthPolicy
+from hash_map_stats import OperationStats
 
 
 class HashMap:
+    # Policy of a map created without one: double the capacity once the load factor reaches 1.0
+    _DEFAULT_POLICY = GrowthPolicy(1.0)
+
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 rehash_step: int = None,
+                 instrument: bool = False,
+                 power_of_two: bool = False,
+                 shrink: bool = False,
+                 policy: GrowthPolicy = None) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        rehash_step turns on incremental resizing: instead of rehashing every node in the put that
+        crosses the load factor, each later operation migrates rehash_step old buckets
+
+        instrument turns on chain-walk length histograms, read with stats()
+
+        power_of_two keeps the capacity a power of two instead of a prime, and picks buckets with a
+        bitmask of the mixed hash code
+
+        shrink turns on automatic shrinking after removals, never below the initial capacity
+
+        policy is the GrowthPolicy (or AdaptivePolicy) that sets the maximum load factor, growth factor
+        and minimum capacity, instead of doubling at a load factor of 1.0
         """
         self._buckets = DynamicArray()
-
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        self._policy = policy if policy is not None else self._DEFAULT_POLICY
+        if self._policy.min_capacity is not None:
+            capacity = max(capacity, self._policy.min_capacity)
+
+        # capacity must be a prime number, or a power of two with its bitmask
+        self._power_of_two = power_of_two
+        self._capacity = self._round_capacity(capacity)
+        self._mask = self._capacity - 1 if power_of_two else None
         for _ in range(self._capacity):
             self._buckets.append(LinkedList())
 
         self._hash_function = function
         self._size = 0
 
+        # Automatic shrinking, which never goes below the policy's minimum (or else the initial) capacity
+        self._shrink = shrink
+        self._min_capacity = self._capacity
+        if self._policy.min_capacity is not None:
+            self._min_capacity = self._round_capacity(self._policy.min_capacity)
+
+        # Chain lengths are only reported to adaptive policies
+        self._observe = self._policy.observe if self._policy.adaptive else None
+
+        # Clear only advances the epoch; a linked list stamped with an older epoch is emptied and
+        # reused the first time it is touched, and _stale marks that such lists may remain
+        self._epoch = 0
+        self._bucket_epochs = [0] * self._capacity
+        self._stale = False
+
+        # Changed by every insert, removal and resize, so iterators can detect a changed map
+        self._version = 0
+
+        # Incremental resize state, the old buckets are only kept while a migration is in progress
+        self._rehash_step = rehash_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+        self._fill_index = 0
+
+        # Chain-walk histograms, None unless instrumentation is on
+        self._stats = OperationStats() if instrument else None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_migration()
+        self._sweep()
         out = ''
         for i in range(self._buckets.length()):
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
@@ -40,36 +103,33 @@ class HashMap:
 
     def _next_prime(self, capacity: int) -> int:
         """
-        Increment from given number and the find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Find the closest prime number from the given number in the shared prime table
         """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
+        return next_prime(capacity)
 
     @staticmethod
     def _is_prime(capacity: int) -> bool:
         """
         Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity == 2 or capacity == 3:
-            return True
+        return is_prime(capacity)
 
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Helper method that returns the capacity the table is built with: the next prime, or the next
+        power of two in power-of-two mode
+        """
+        if self._power_of_two:
+            return 1 << max(0, capacity - 1).bit_length()
+        return self._next_prime(capacity)
 
-        return True
+    def _index(self, code: int, capacity: int) -> int:
+        """
+        Helper method that returns the bucket index of a hash code in a table of the given capacity
+        """
+        if self._power_of_two:
+            return mix64(code) & (capacity - 1)
+        return code % capacity
 
     def get_size(self) -> int:
         """
@@ -94,71 +154,205 @@ class HashMap:
         If the key exists, the associated value is replaced with the new value
         If the key does not exist, a new key/value pair is added
 
-        The table's capacity is doubled if the current load factor is >= 1.0
+        The table's capacity is grown by the policy's growth factor (doubled by default) if the
+        current load factor is >= the policy's maximum load factor (1.0 by default)
         """
 
-        # Calculate the load factor of the hash map
-        load_factor = self._size / self._capacity
+        # Move part of an in-progress incremental resize along
+        if self._old_buckets is not None:
+            self._migrate_step()
 
-        # If the load factor is >= 1, call the resize_table method to double the table's capacity
-        if load_factor >= 1.0:
-            self.resize_table()
-
-        # Calculate and retrieve the index to access the appropriate linked list
-        index = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[index]
+        # Hash the key once and retrieve the linked list it belongs to
+        code = self._hash_function(key)
+        linked_list = self._bucket(code)
+        if self._observe is not None:
+            self._observe(linked_list.length())
 
         # If the key exists, the value is replaced with the new value
-        if linked_list.contains(key):
-            linked_list.contains(key).value = value
-        # If the key does not exist, add a new key/value pair
+        if self._stats is None:
+            node = linked_list.contains(key, code)
         else:
-            linked_list.insert(key, value)
-            self._size += 1
+            node = self._walk('put', linked_list, key, code)
+        if node:
+            node.value = value
+            return
+
+        # If the load factor is >= the maximum, grow the table's capacity (all at once or incrementally)
+        # before the new key is added, so updating an existing key never resizes
+        if self._size / self._capacity >= self._policy.max_load:
+            capacity = self._grown_capacity(self._capacity, self._size + 1)
+            if self._rehash_step:
+                self._start_migration(capacity)
+            else:
+                self.resize_table(capacity)
+            linked_list = self._bucket(code)
+
+        # Add the new key/value pair and cache its hash code
+        linked_list.insert(key, value, code)
+        self._size += 1
+        self._version += 1
 
     def resize_table(self, new_capacity: int = None) -> None:
         """
         This method changes the capacity of the internal hash table
         Existing key/value pairs will remain in the new hash map, and all hash table links are rehashed
         """
+        # An explicit resize always completes any incremental resize first
+        self._finish_migration()
+        self._sweep()
+
         if new_capacity is None:
-            new_capacity = self._double_capacity()
+            new_capacity = self._grow_capacity()
 
         # Check if new_capacity is less than 1
         if new_capacity < 1:
             return
 
-        # Ensure new_capacity is a prime number
-        new_capacity = self._next_prime(new_capacity)
+        # Ensure new_capacity is a prime number (or a power of two)
+        new_capacity = self._round_capacity(new_capacity)
 
-        # Create a new array of linked lists with the updated capacity
-        new_buckets = DynamicArray()
-        for _ in range(new_capacity):
-            new_buckets.append(LinkedList())
+        # Create a new array with the updated capacity, its linked lists are filled in by the rehash
+        new_buckets = DynamicArray([None] * new_capacity)
 
         # Rehash all hash table links
         self._rehash_and_update(new_buckets, new_capacity)
 
-    def _double_capacity(self) -> int:
+    def _grow_capacity(self) -> int:
         """
-        Helper method to double the current capacity and find the next prime number
+        Helper method to grow the current capacity by the policy's growth factor and find the next
+        prime number (or power of two)
         """
-        return self._next_prime(2 * self._capacity)
+        return self._round_capacity(self._policy.grown_capacity(self._capacity))
 
     def _rehash_and_update(self, new_buckets: DynamicArray, new_capacity: int) -> None:
         """
         Helper method to rehash all key/value pairs into the new buckets and updates the hash map
+        Nodes are relinked rather than copied, and the emptied old linked lists become new buckets
         """
-        # Rehash all key/value pairs into the new buckets
+        mask = new_capacity - 1 if self._power_of_two else None
+        spare_lists = []
+
+        # Move all nodes into the new buckets using their cached hash codes, in the same order as insert
         for i in range(self._capacity):
             old_linked_list = self._buckets[i]
-            for node in old_linked_list:
-                new_index = self._hash_function(node.key) % new_capacity
-                new_buckets[new_index].insert(node.key, node.value)
+            node = old_linked_list.detach()
+            spare_lists.append(old_linked_list)
 
-        # Update the hash map with the new capacity and buckets
-        self._capacity = new_capacity
+            while node:
+                next_node = node.next
+                new_index = node.hash % new_capacity if mask is None else mix64(node.hash) & mask
+                linked_list = new_buckets[new_index]
+                if linked_list is None:
+                    linked_list = new_buckets[new_index] = spare_lists.pop() if spare_lists else LinkedList()
+                linked_list.insert_node(node)
+                node = next_node
+
+        # Fill the remaining buckets, using up the old linked lists first
+        for i in range(new_capacity):
+            if new_buckets[i] is None:
+                new_buckets[i] = spare_lists.pop() if spare_lists else LinkedList()
+
+        # Update the hash map with the new capacity, bitmask and buckets
+        self._capacity, self._mask = new_capacity, mask
         self._buckets = new_buckets
+        self._bucket_epochs = [self._epoch] * new_capacity
+        self._version += 1
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        Helper method that starts an incremental resize
+        The old buckets stay in place and are migrated to the new buckets by later operations
+        """
+        self._finish_migration()
+        self._sweep()
+
+        # Empty linked lists are created lazily, so allocating the new table stays cheap
+        self._old_buckets, self._old_capacity = self._buckets, self._capacity
+        self._buckets, self._capacity = DynamicArray([None] * new_capacity), new_capacity
+        self._bucket_epochs = [self._epoch] * new_capacity
+        if self._power_of_two:
+            self._mask = new_capacity - 1
+        self._migrate_index = 0
+        self._fill_index = 0
+        self._version += 1
+
+    def _migrate_step(self, step: int = None) -> None:
+        """
+        Helper method that migrates a bounded number of old buckets into the new buckets
+        and fills a matching share of the new buckets with empty linked lists
+        """
+        if step is None:
+            step = self._rehash_step
+
+        # Move the nodes of the next old buckets into the new buckets using their cached hash codes
+        end = min(self._migrate_index + step, self._old_capacity)
+        for i in range(self._migrate_index, end):
+            for node in self._old_buckets[i]:
+                new_index = self._index(node.hash, self._capacity)
+                linked_list = self._buckets[new_index]
+                if linked_list is None:
+                    linked_list = self._buckets[new_index] = LinkedList()
+                linked_list.insert(node.key, node.value, node.hash)
+            self._old_buckets[i] = None
+        self._migrate_index = end
+
+        # Fill the new buckets at the same relative pace, so both finish together
+        fill_share = -(-step * self._capacity // self._old_capacity)
+        fill_end = min(self._fill_index + fill_share, self._capacity)
+        for i in range(self._fill_index, fill_end):
+            if self._buckets[i] is None:
+                self._buckets[i] = LinkedList()
+        self._fill_index = fill_end
+
+        if self._migrate_index == self._old_capacity and self._fill_index == self._capacity:
+            self._old_buckets = None
+
+    def _finish_migration(self) -> None:
+        """
+        Helper method that completes an in-progress incremental resize, if there is one
+        """
+        if self._old_buckets is not None:
+            self._migrate_step(max(self._old_capacity, self._capacity))
+
+    def _bucket(self, code: int) -> LinkedList:
+        """
+        Helper method that returns the linked list a key with the given hash code belongs to
+        While an incremental resize is in progress, keys of old buckets that have not been
+        migrated yet still live in the old buckets
+        """
+        if self._old_buckets is not None:
+            old_index = self._index(code, self._old_capacity)
+            if old_index >= self._migrate_index:
+                return self._old_buckets[old_index]
+
+        index = code % self._capacity if self._mask is None else mix64(code) & self._mask
+        linked_list = self._buckets[index]
+        if linked_list is None or self._bucket_epochs[index] != self._epoch:
+            linked_list = self._bucket_at(index)
+        return linked_list
+
+    def _bucket_at(self, index: int) -> LinkedList:
+        """
+        Helper method that returns the linked list at the given index of the current table, creating it
+        if it does not exist yet and emptying it if it was filled before the last clear
+        """
+        linked_list = self._buckets[index]
+        if linked_list is None:
+            linked_list = self._buckets[index] = LinkedList()
+        elif self._bucket_epochs[index] != self._epoch:
+            linked_list.detach()
+        self._bucket_epochs[index] = self._epoch
+        return linked_list
+
+    def _sweep(self) -> None:
+        """
+        Helper method that empties every linked list left over from before the last clear, so code
+        that walks the whole table only sees current buckets
+        """
+        if self._stale:
+            for index in range(self._capacity):
+                self._bucket_at(index)
+            self._stale = False
 
     def table_load(self) -> float:
         """
@@ -170,6 +364,9 @@ class HashMap:
         """
         This method returns the number of empty buckets in the hash table
         """
+        self._finish_migration()
+        self._sweep()
+
         # Keeps track of the # of buckets
         empty_tracker = 0
 
@@ -189,12 +386,21 @@ class HashMap:
         """
         This method returns the value associated with the given key
         """
-        # Calculate the hash value for the given key and find the corresponding index in the hash table
-        index = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[index]
+        # Move part of an in-progress incremental resize along
+        if self._old_buckets is not None:
+            self._migrate_step()
+
+        # Find the linked list the given key belongs to
+        code = self._hash_function(key)
+        linked_list = self._bucket(code)
+        if self._observe is not None:
+            self._observe(linked_list.length())
 
         # Check if the key exists in the linked list
-        node = linked_list.contains(key)
+        if self._stats is None:
+            node = linked_list.contains(key, code)
+        else:
+            node = self._walk('get', linked_list, key, code)
 
         # If the key is found, return the associated value; otherwise, return None
         if node:
@@ -206,12 +412,23 @@ class HashMap:
         """
         This method returns True if the given key is in the hash map, otherwise it returns False
         """
-        # Calculate the hash value for the given key and find the corresponding index in the hash table
-        index = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[index]
+        # Move part of an in-progress incremental resize along
+        if self._old_buckets is not None:
+            self._migrate_step()
+
+        # Find the linked list the given key belongs to
+        code = self._hash_function(key)
+        linked_list = self._bucket(code)
+        if self._observe is not None:
+            self._observe(linked_list.length())
 
         # Check if the key exists in the hash map
-        if linked_list.contains(key) is not None:
+        if self._stats is None:
+            node = linked_list.contains(key, code)
+        else:
+            node = self._walk('contains_key', linked_list, key, code)
+
+        if node is not None:
             return True
         else:
             return False
@@ -220,20 +437,116 @@ class HashMap:
         """
         This method removes the given key and its associated value from the hash map
         """
-        # Calculate the hash value for the given key and find the corresponding index in the hash table
-        index = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[index]
+        # Move part of an in-progress incremental resize along
+        if self._old_buckets is not None:
+            self._migrate_step()
+
+        # Find the linked list the given key belongs to
+        code = self._hash_function(key)
+        linked_list = self._bucket(code)
 
-        # Check if the key is in the linked list before removing it
-        if linked_list.contains(key) is not None:
-            linked_list.remove(key)
+        if self._stats is not None:
+            self._walk('remove', linked_list, key, code)
+
+        # Remove the key in a single pass, updating the size only if it was found
+        if linked_list.remove(key, code):
             self._size -= 1
+            self._version += 1
+            self._shrink_if_needed()
+
+    def _shrink_if_needed(self) -> None:
+        """
+        Helper method that shrinks the table (all at once or incrementally) once the load factor
+        falls below the low-water mark, if shrinking is on
+        """
+        if not self._shrink or self._old_buckets is not None:
+            return
+        if self._size >= self._policy.shrink_load * self._capacity:
+            return
+
+        capacity = self._round_capacity(max(self._min_capacity, self._policy.shrunk_capacity(self._size)))
+        if capacity < self._capacity:
+            if self._rehash_step:
+                self._start_migration(capacity)
+            else:
+                self.resize_table(capacity)
+
+    def _walk(self, operation: str, linked_list: LinkedList, key: str, code: int):
+        """
+        Helper method that finds the node holding the given key like LinkedList.contains, recording
+        the number of nodes walked (the whole chain when the key is missing) for the given operation
+        """
+        length = 0
+        node = linked_list._head
+        while node:
+            length += 1
+            if node.hash == code and node.key == key:
+                break
+            node = node.next
+
+        self._stats.record(operation, length)
+        return node
+
+    def stats(self) -> dict:
+        """
+        This method returns the count, mean, p50, p99 and max chain-walk length of each operation
+        """
+        if self._stats is None:
+            raise ValueError("instrumentation is off, create the HashMap with instrument=True")
+        return self._stats.summary()
+
+    def reset_stats(self) -> None:
+        """
+        This method clears the recorded chain-walk lengths
+        """
+        if self._stats is None:
+            raise ValueError("instrumentation is off, create the HashMap with instrument=True")
+        self._stats = OperationStats()
+
+    def keys(self):
+        """
+        This method returns an iterator over the keys of the hash map
+        """
+        return (node.key for node in self._nodes())
+
+    def values(self):
+        """
+        This method returns an iterator over the values of the hash map
+        """
+        return (node.value for node in self._nodes())
+
+    def items(self):
+        """
+        This method returns an iterator over the (key, value) tuples of the hash map
+        """
+        return ((node.key, node.value) for node in self._nodes())
+
+    def _nodes(self):
+        """
+        Helper generator that yields the nodes of every chain in bucket order without copying them
+        A put of a new key, a remove or a resize between two steps raises RuntimeError
+        """
+        self._finish_migration()
+        self._sweep()
+
+        version = self._version
+        buckets = self._buckets
+        for index in range(self._capacity):
+            node = buckets[index]._head
+            while node:
+                yield node
+                if self._version != version:
+                    raise RuntimeError("HashMap changed during iteration")
+                node = node.next
 
     def get_keys_and_values(self) -> DynamicArray:
         """
         This method returns a dynamic array where each index contains a tuple of a key/value pair
         stored in the hash map
         """
+        self._finish_migration()
+        self._sweep()
+
         # Initialize an empty dynamic array to store key/value tuples
         result = DynamicArray()
 
@@ -259,28 +572,173 @@ class HashMap:
 
     def clear(self) -> None:
         """
-        This method clears the contents of the hash map
+        This method clears the contents of the hash map in constant time
+        Every bucket is marked stale by moving to a new epoch; a stale linked list is emptied and
+        reused the first time its bucket is touched again, instead of being walked here
         """
+        # A migration in progress is dropped along with its entries
+        self._old_buckets = None
+
+        # With shrinking on, the table goes back to its initial capacity, its linked lists are created lazily
+        if self._shrink and self._capacity > self._min_capacity:
+            self._capacity = self._min_capacity
+            if self._power_of_two:
+                self._mask = self._capacity - 1
+            self._buckets = DynamicArray([None] * self._capacity)
+            self._bucket_epochs = [self._epoch] * self._capacity
+
+        self._epoch += 1
+        self._stale = True
+        self._size = 0
+        self._version += 1
 
-        index = 0
-        while index < self._buckets.length():
-            # Get the linked list at the current index
-            linked_list = self._buckets[index]
+    def put_many(self, keys, values) -> None:
+        """
+        This method updates the key/value pairs of a whole batch in the hash map
 
-            # Use a while loop to iterate through the linked list
-            current_node = linked_list._head
-            while current_node:
-                # Save the reference to the next node before removing the current one
-                next_node = current_node.next
-                # Remove the current node from the linked list
-                linked_list.remove(current_node.key)
-                # Update the size of the hash map
-                self._size -= 1
-                # Move to the next node in the linked list
-                current_node = next_node
+        The result is the same as calling put for every pair in order, down to the order of every chain:
+        the batch is split where those puts would grow the table, and within each part every key is
+        hashed once and every bucket's chain is walked once
+        """
+        keys, values = as_list(keys), as_list(values)
+        if len(keys) != len(values):
+            raise ValueError("put_many needs one value per key")
+
+        if self._rehash_step or self._policy.adaptive:
+            # Incremental resizes and adaptive load factors move along with every single put
+            for key, value in zip(keys, values):
+                self.put(key, value)
+            return
 
-            # Move to the next index in the hash map
-            index += 1
+        hashes = hash_many(keys, self._hash_function)
+        start = 0
+        while start < len(keys):
+            room = self._room()
+            if room == 0:
+                # put grows the table before the next new key, but an update leaves it as it is
+                node = self._bucket(hashes[start]).contains(keys[start], hashes[start])
+                if node:
+                    node.value = values[start]
+                    start += 1
+                    continue
+                self.resize_table(self._grown_capacity(self._capacity, self._size + 1))
+                room = self._room()
+
+            # The next room pairs add at most room new keys, so put would not grow the table among them
+            end = min(start + room, len(keys))
+            self._put_part(keys, values, hashes, start, end)
+            start = end
+
+    def _room(self) -> int:
+        """
+        Helper method that returns how many new keys put adds before the load factor reaches the maximum
+        """
+        room = max(0, math.ceil(self._policy.max_load * self._capacity) - self._size)
+        while room and (self._size + room - 1) / self._capacity >= self._policy.max_load:
+            room -= 1
+        while (self._size + room) / self._capacity < self._policy.max_load:
+            room += 1
+        return room
+
+    def _put_part(self, keys: list, values: list, hashes: list, start: int, end: int) -> None:
+        """
+        Helper method that puts the pairs at positions start to end of a batch, one bucket at a time
+        """
+        for index, positions in self._bucket_groups(hashes[start:end]):
+            positions = [start + position for position in positions]
+            linked_list = self._bucket_at(index)
+            matches = self._match_chain(linked_list, keys, positions)
+
+            # Nodes inserted by this group, so repeated keys inside the batch update them
+            inserted = {}
+            for slot, position in enumerate(positions):
+                key, node = keys[position], matches[slot]
+                if node is None:
+                    node = inserted.get(key)
+
+                if node is None:
+                    linked_list.insert(key, values[position], hashes[position])
+                    inserted[key] = linked_list._head
+                    self._size += 1
+                    self._version += 1
+                else:
+                    node.value = values[position]
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method returns a dynamic array with the value associated with each given key, or None
+        """
+        result = DynamicArray()
+        for node in self._find_many(as_list(keys)):
+            result.append(node.value if node else None)
+        return result
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        This method returns a dynamic array with True for each given key in the hash map, otherwise False
+        """
+        result = DynamicArray()
+        for node in self._find_many(as_list(keys)):
+            result.append(node is not None)
+        return result
+
+    def _find_many(self, keys: list) -> list:
+        """
+        Helper method that returns the matching node (or None) for every key in the batch
+        """
+        self._finish_migration()
+        nodes = [None] * len(keys)
+        for index, positions in self._bucket_groups(hash_many(keys, self._hash_function)):
+            matches = self._match_chain(self._bucket_at(index), keys, positions)
+            for slot, position in enumerate(positions):
+                nodes[position] = matches[slot]
+        return nodes
+
+    def _bucket_groups(self, hashes: list):
+        """
+        Helper method that yields each bucket index touched by a batch with the batch positions that
+        hash to it, keeping the positions in their original batch order
+        """
+        indices = [self._index(code, self._capacity) for code in hashes]
+        order = sorted(range(len(indices)), key=indices.__getitem__)
+
+        start = 0
+        while start < len(order):
+            index = indices[order[start]]
+            end = start + 1
+            while end < len(order) and indices[order[end]] == index:
+                end += 1
+            yield index, order[start:end]
+            start = end
+
+    @staticmethod
+    def _match_chain(linked_list: LinkedList, keys: list, positions: list) -> list:
+        """
+        Helper method that walks a chain once and returns the node matching each batch position
+        """
+        # Scratch index from each pending key to the group slots asking for it
+        pending = {}
+        for slot, position in enumerate(positions):
+            pending.setdefault(keys[position], []).append(slot)
+
+        matches = [None] * len(positions)
+        node = linked_list._head
+        while node and pending:
+            slots = pending.pop(node.key, None)
+            if slots:
+                for slot in slots:
+                    matches[slot] = node
+            node = node.next
+        return matches
+
+    def _grown_capacity(self, capacity: int, size: int) -> int:
+        """
+        Helper method that follows the growth done by put until the put of the size-th key would no
+        longer grow the capacity
+        """
+        while (size - 1) / capacity >= self._policy.max_load:
+            capacity = self._round_capacity(self._policy.grown_capacity(capacity))
+        return capacity
 
 
 def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
@@ -307,6 +765,13 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
             frequency_map.put(value, current_count + 1)
         index += 1
 
+    return _modes_of(frequency_map)
+
+
+def _modes_of(frequency_map: HashMap) -> tuple[DynamicArray, int]:
+    """
+    Helper method that returns the mode value(s) of a frequency map and their frequency
+    """
     # Find the mode(s) and their frequency using a while loop
     mode_values = DynamicArray()
     max_frequency = 0
@@ -332,6 +797,176 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     return mode_values, max_frequency
 
 
+def iterate_values(values):
+    """
+    This method yields the values of a DynamicArray by index, or of any other iterable directly
+    """
+    if isinstance(values, DynamicArray):
+        for index in range(values.length()):
+            yield values.get_at_index(index)
+    else:
+        yield from values
+
+
+def find_mode_streaming(values, counters: int = 1024) -> tuple[DynamicArray, int, int]:
+    """
+    This method finds the mode of a stream of values in bounded memory, using a Misra-Gries
+    summary stored in a HashMap that never holds more than the given number of counters
+
+    It accepts a DynamicArray or any iterable (including generators) and returns a tuple of
+    the mode candidates, the highest counted frequency and an error bound:
+    - the true frequency of the mode is between frequency and frequency + error
+    - every value whose true frequency could reach that of the mode is among the candidates
+      (when error >= frequency, values that were dropped from the summary could be modes too)
+    When the number of distinct values fits in the counters the error is 0 and the result is exact
+    """
+    if counters < 1:
+        raise ValueError("find_mode_streaming needs at least one counter")
+
+    summary = HashMap(counters + 1)
+    error = 0
+
+    for value in iterate_values(values):
+        count = summary.get(value)
+
+        if count is not None:
+            summary.put(value, count + 1)
+        elif summary.get_size() < counters:
+            summary.put(value, 1)
+        else:
+            # The summary is full: decrement every counter (and drop the new value) instead
+            key_values = summary.get_keys_and_values()
+            for index in range(key_values.length()):
+                key, count = key_values.get_at_index(index)
+                if count == 1:
+                    summary.remove(key)
+                else:
+                    summary.put(key, count - 1)
+            error += 1
+
+    # Every counted frequency undercounts the true one by at most the number of decrements
+    max_frequency = 0
+    key_values = summary.get_keys_and_values()
+    for index in range(key_values.length()):
+        max_frequency = max(max_frequency, key_values.get_at_index(index)[1])
+
+    mode_values = DynamicArray()
+    for index in range(key_values.length()):
+        key, count = key_values.get_at_index(index)
+        if count + error >= max_frequency:
+            mode_values.append(key)
+
+    return mode_values, max_frequency, error
+
+
+# Values shared with the find_mode_parallel worker processes, set once per worker by the pool initializer
+_shard_source = None
+
+
+def _set_shard_source(source) -> None:
+    """
+    Helper method run once in each worker process to receive the values (or file path) to count
+    """
+    global _shard_source
+    _shard_source = source
+
+
+def _shard_values(shard: tuple):
+    """
+    Helper method that yields the values of one shard
+    A shard of a list is a range of indices; a shard of a file is a range of byte offsets and holds
+    every line that starts inside that range
+    """
+    start, end = shard
+    if not isinstance(_shard_source, (str, os.PathLike)):
+        yield from _shard_source[start:end]
+        return
+
+    with open(_shard_source, 'rb') as file:
+        if start > 0:
+            # Skip the line that started in the previous shard
+            file.seek(start - 1)
+            file.readline()
+        while file.tell() < end:
+            line = file.readline()
+            if not line:
+                break
+            yield line.rstrip(b'\n').rstrip(b'\r').decode()
+
+
+def _count_shard(shard: tuple) -> tuple[list, int]:
+    """
+    Helper method that counts one shard with its own HashMap
+    Returns (value, count, index of first occurrence in the shard) records and the shard length
+    """
+    counts = HashMap()
+    length = 0
+    for value in _shard_values(shard):
+        record = counts.get(value)
+        if record is None:
+            counts.put(value, [1, length])
+        else:
+            record[0] += 1
+        length += 1
+
+    key_values = counts.get_keys_and_values()
+    records = []
+    for index in range(key_values.length()):
+        value, (count, first) = key_values.get_at_index(index)
+        records.append((value, count, first))
+    return records, length
+
+
+def find_mode_parallel(source, workers: int = None) -> tuple[DynamicArray, int]:
+    """
+    This method returns the same result as find_mode, ties and their order included, while counting
+    the values in shards on several worker processes
+
+    The source is a DynamicArray (or list) of values, or the path of a text file with one value per line
+    Each worker counts its shard with its own HashMap, then the partial counts are merged
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if isinstance(source, (str, os.PathLike)):
+        total = os.path.getsize(source)
+    else:
+        source = as_list(source)
+        total = len(source)
+
+    # Split the source into one contiguous shard per worker
+    step = -(-total // workers) if total else 1
+    shards = [(start, min(start + step, total)) for start in range(0, total, step)]
+
+    if workers == 1 or len(shards) <= 1:
+        _set_shard_source(source)
+        results = [_count_shard(shard) for shard in shards]
+    else:
+        with multiprocessing.Pool(len(shards), _set_shard_source, (source,)) as pool:
+            results = pool.map(_count_shard, shards)
+
+    # Merge the partial counts; shards are in input order, so the first sighting of a value is its first occurrence
+    merged = HashMap()
+    for shard_number, (records, _) in enumerate(results):
+        for value, count, first in records:
+            record = merged.get(value)
+            if record is None:
+                merged.put(value, [count, (shard_number, first)])
+            else:
+                record[0] += count
+
+    # Rebuild the frequency map exactly as find_mode builds it: values are inserted in order of first
+    # occurrence, so the table resizes at the same points and get_keys_and_values has the same order
+    key_values = merged.get_keys_and_values()
+    records = [key_values.get_at_index(index) for index in range(key_values.length())]
+    records.sort(key=lambda record: record[1][1])
+
+    frequency_map = HashMap()
+    for value, (count, first) in records:
+        frequency_map.put(value, count)
+
+    return _modes_of(frequency_map)
+
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
@@ -532,3 +1167,15 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nfind_mode_streaming example 1")
+    print("-----------------------------")
+    for case in test_cases:
+        mode, frequency, error = find_mode_streaming(iter(case), counters=16)
+        print(f"Input: {case}\nMode : {mode}, Frequency: {frequency}, Error: {error}\n")
+
+    print("\nfind_mode_streaming example 2")
+    print("-----------------------------")
+    stream = (str(i % 7) if i % 3 else 'hot' for i in range(3000))
+    mode, frequency, error = find_mode_streaming(stream, counters=4)
+    print(f"Mode : {mode}, Frequency: {frequency} (true frequency at most {frequency + error})")
@@ -0,0 +1,214 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Sharding
+# Due Date: December 8, 2023
+# Description: This program implements a thread-safe HashMap that routes every key to one of several
+# independent SC (or OA) HashMap shards, each guarded by its own lock
+
+import threading
+
+from a6_include import (DynamicArray,
+                        hash_function_1, hash_function_2)
+from hash_batch import as_list, hash_many
+import hash_map_sc
+
+
+class HashMap:
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 shards: int = 16,
+                 map_class: type = hash_map_sc.HashMap) -> None:
+        """
+        Initialize new HashMap made of independent shards
+        The capacity is split between the shards; map_class is hash_map_sc.HashMap,
+        hash_map_oa.HashMap or any class sharing their API
+        """
+        if shards < 1:
+            raise ValueError("HashMap needs at least one shard")
+
+        self._hash_function = function
+        self._shards = [map_class(max(1, capacity // shards), function) for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._shard_count = shards
+
+    def get_size(self) -> int:
+        """
+        Return size of map, summed over the shards one shard at a time
+        """
+        size = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                size += shard.get_size()
+        return size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, summed over the shards one shard at a time
+        """
+        capacity = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                capacity += shard.get_capacity()
+        return capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method updates the key/value pair in the shard the key belongs to
+        """
+        # Route the key to its shard
+        index = self._hash_function(key) % self._shard_count
+        with self._locks[index]:
+            self._shards[index].put(key, value)
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key
+        """
+        # Route the key to its shard
+        index = self._hash_function(key) % self._shard_count
+        with self._locks[index]:
+            return self._shards[index].get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        # Route the key to its shard
+        index = self._hash_function(key) % self._shard_count
+        with self._locks[index]:
+            return self._shards[index].contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map
+        """
+        # Route the key to its shard
+        index = self._hash_function(key) % self._shard_count
+        with self._locks[index]:
+            self._shards[index].remove(key)
+
+    def put_many(self, keys, values) -> None:
+        """
+        This method updates the key/value pairs of a whole batch, locking one shard at a time
+        Shards that provide put_many receive their part of the batch in one call
+        """
+        keys, values = as_list(keys), as_list(values)
+        if len(keys) != len(values):
+            raise ValueError("put_many needs one value per key")
+
+        for index, positions in self._shard_groups(keys):
+            shard_keys = [keys[position] for position in positions]
+            shard_values = [values[position] for position in positions]
+            with self._locks[index]:
+                shard = self._shards[index]
+                if hasattr(shard, 'put_many'):
+                    shard.put_many(shard_keys, shard_values)
+                else:
+                    for key, value in zip(shard_keys, shard_values):
+                        shard.put(key, value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method returns a dynamic array with the value associated with each given key, or None
+        """
+        keys = as_list(keys)
+        result = [None] * len(keys)
+        for index, positions in self._shard_groups(keys):
+            with self._locks[index]:
+                shard = self._shards[index]
+                for position in positions:
+                    result[position] = shard.get(keys[position])
+        return DynamicArray(result)
+
+    def _shard_groups(self, keys: list) -> list:
+        """
+        Helper method that groups the positions of a batch of keys by shard, hashing every key once
+        """
+        groups = [[] for _ in self._shards]
+        for position, code in enumerate(hash_many(keys, self._hash_function)):
+            groups[code % self._shard_count].append(position)
+        return [(index, positions) for index, positions in enumerate(groups) if positions]
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method changes the capacity of every shard to its share of the new capacity
+        """
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.resize_table(max(1, new_capacity // self._shard_count))
+
+    def table_load(self) -> float:
+        """
+        This method returns the load factor of the hash map as a whole
+        """
+        return self.get_size() / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets over all shards
+        """
+        empty = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                empty += shard.empty_buckets()
+        return empty
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array of key/value tuples, copying one shard at a time
+        The result is consistent per shard, not across shards
+        """
+        result = DynamicArray()
+        for key_value in self:
+            result.append(key_value)
+        return result
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of every shard
+        """
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def __iter__(self):
+        """
+        This method yields the key/value tuples of the hash map
+        Each shard is copied under its lock, so other threads are only blocked from one shard at a time
+        """
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                key_values = shard.get_keys_and_values()
+            for index in range(key_values.length()):
+                yield key_values.get_at_index(index)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nSharded - put example 1")
+    print("-----------------------")
+    m = HashMap(53, hash_function_1, shards=4)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nSharded - threads example 1")
+    print("---------------------------")
+    m = HashMap(11, hash_function_2, shards=8)
+
+    def writer(start: int) -> None:
+        for i in range(start, start + 500):
+            m.put(str(i), i)
+
+    threads = [threading.Thread(target=writer, args=(start,)) for start in range(0, 2000, 500)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(m.get_size(), all(m.get(str(i)) == i for i in range(2000)))
@@ -0,0 +1,240 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Snapshots
+# Due Date: December 8, 2023
+# Description: This program saves an Open Addressing HashMap to a fixed-layout file and opens it
+# again as a read-only map that probes the memory-mapped file directly
+#
+# File layout (all integers little-endian):
+#   header   magic b'A6OA', version, capacity, size, hash function id, slot table offset,
+#            key arena offset, value arena offset
+#   slots    capacity slots of (hash code, key offset, value offset, key length, value length);
+#            a key length of EMPTY_SLOT marks an empty slot
+#   keys     UTF-8 encoded keys, back to back
+#   values   pickled values, back to back
+# Slots follow the same quadratic probing as hash_map_oa.HashMap, without any tombstones
+
+import mmap
+import pickle
+import struct
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+
+
+MAGIC = b'A6OA'
+VERSION = 1
+
+HEADER = struct.Struct('<4sIQQIIQQQ')
+SLOT = struct.Struct('<QQQII')
+EMPTY_SLOT = 0xFFFFFFFF
+
+# Hash codes are stored as unsigned 64-bit integers
+HASH_MASK = (1 << 64) - 1
+
+# Hash function ids; any other function is saved as CUSTOM_FUNCTION and must be given again on open
+CUSTOM_FUNCTION = 0
+HASH_FUNCTIONS = {1: hash_function_1, 2: hash_function_2}
+
+
+def _function_id(function) -> int:
+    """
+    Helper method that returns the id stored in the header for a hash function
+    """
+    for function_id, known in HASH_FUNCTIONS.items():
+        if known is function:
+            return function_id
+    return CUSTOM_FUNCTION
+
+
+def write_snapshot(path: str, capacity: int, function, entries) -> None:
+    """
+    This method writes a snapshot file from (hash code, key, value) entries of a map with the given capacity
+    """
+    entries = list(entries)
+    if 2 * len(entries) >= capacity:
+        # Quadratic probing only reaches half of a prime-sized table
+        raise ValueError("snapshot capacity must be more than twice the number of entries")
+
+    # Place every entry with quadratic probing into a table without tombstones
+    slots = [None] * capacity
+    for entry in entries:
+        code = entry[0] & HASH_MASK
+        home_index = code % capacity
+        probe_count = 0
+        index = home_index
+        while slots[index] is not None:
+            probe_count += 1
+            index = (home_index + probe_count * probe_count) % capacity
+        slots[index] = (code, entry[1].encode(), pickle.dumps(entry[2]))
+
+    slot_offset = HEADER.size
+    key_offset = slot_offset + capacity * SLOT.size
+    value_offset = key_offset + sum(len(slot[1]) for slot in slots if slot)
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, capacity, len(entries), _function_id(function), 0,
+                               slot_offset, key_offset, value_offset))
+
+        # Slot table, with arena offsets assigned in slot order
+        next_key, next_value = key_offset, value_offset
+        for slot in slots:
+            if slot is None:
+                file.write(SLOT.pack(0, 0, 0, EMPTY_SLOT, 0))
+                continue
+            code, key, value = slot
+            file.write(SLOT.pack(code, next_key, next_value, len(key), len(value)))
+            next_key += len(key)
+            next_value += len(value)
+
+        for slot in slots:
+            if slot:
+                file.write(slot[1])
+        for slot in slots:
+            if slot:
+                file.write(slot[2])
+
+
+class MappedHashMap:
+    """
+    Read-only Open Addressing HashMap backed by a memory-mapped snapshot file
+    Lookups probe the file directly; only the keys compared and the value returned are decoded
+    """
+
+    def __init__(self, path: str, function=None) -> None:
+        """
+        Open a snapshot file; function is required only for maps saved with a custom hash function
+        """
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self._capacity, self._size, function_id, _,
+         self._slot_offset, self._key_offset, self._value_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} HashMap snapshot")
+
+        if function is None:
+            function = HASH_FUNCTIONS.get(function_id)
+            if function is None:
+                self._map.close()
+                raise ValueError(f"{path} was saved with a custom hash function, pass it as function")
+        self._hash_function = function
+
+    def __enter__(self) -> "MappedHashMap":
+        """Return the map for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the map at the end of a with statement."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        This method unmaps the snapshot file
+        """
+        self._map.close()
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def table_load(self) -> float:
+        """
+        This method returns the current hash table load factor
+        """
+        return self._size / self._capacity
+
+    def _slot(self, index: int) -> tuple:
+        """
+        Helper method that reads the slot at the given index
+        """
+        return SLOT.unpack_from(self._map, self._slot_offset + index * SLOT.size)
+
+    def _find(self, key: str) -> tuple:
+        """
+        Helper method that returns the slot holding the given key, or None if it is not in the map
+        """
+        encoded = key.encode()
+        code = self._hash_function(key) & HASH_MASK
+        home_index = code % self._capacity
+        probe_count = 0
+
+        while probe_count < self._capacity:
+            slot = self._slot((home_index + probe_count * probe_count) % self._capacity)
+            slot_code, key_offset, _, key_length, _ = slot
+
+            if key_length == EMPTY_SLOT:
+                # Reached an empty slot, key is not in the map
+                return None
+
+            if (slot_code == code and key_length == len(encoded)
+                    and self._map[key_offset:key_offset + key_length] == encoded):
+                return slot
+
+            probe_count += 1
+
+        return None
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key
+        """
+        slot = self._find(key)
+        if slot is None:
+            return None
+        value_offset, value_length = slot[2], slot[4]
+        return pickle.loads(self._map[value_offset:value_offset + value_length])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the map, otherwise it returns False
+        """
+        return self._find(key) is not None
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Snapshot maps are read-only
+        """
+        raise TypeError("a mapped snapshot is read-only")
+
+    def remove(self, key: str) -> None:
+        """
+        Snapshot maps are read-only
+        """
+        raise TypeError("a mapped snapshot is read-only")
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array where each index contains a tuple of a key/value pair stored in the map
+        """
+        key_value_pairs = DynamicArray()
+        for entry in self:
+            key_value_pairs.append((entry.key, entry.value))
+        return key_value_pairs
+
+    def __iter__(self):
+        """
+        This method yields a HashEntry for every key/value pair, decoding them one at a time
+        """
+        for index in range(self._capacity):
+            code, key_offset, value_offset, key_length, value_length = self._slot(index)
+            if key_length != EMPTY_SLOT:
+                yield HashEntry(self._map[key_offset:key_offset + key_length].decode(),
+                                pickle.loads(self._map[value_offset:value_offset + value_length]),
+                                code)
+
+
+def open_mapped(path: str, function=None) -> MappedHashMap:
+    """
+    This method opens a snapshot written by hash_map_oa.HashMap.save as a read-only map
+    """
+    return MappedHashMap(path, function)
@@ -0,0 +1,364 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Open Addressing (Struct of Arrays)
+# Due Date: December 8, 2023
+# Description: This program implements an Open Addressing HashMap with Quadratic Probing that keeps
+# keys, values, hash codes and slot states in parallel flat arrays instead of HashEntry objects
+
+from array import array
+
+from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
+                        hash_function_1, hash_function_2)
+from hash_primes import is_prime, next_prime
+
+
+# Slot states kept in the state bytearray
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+# Hash codes are stored as unsigned 64-bit integers
+_HASH_MASK = (1 << 64) - 1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper method that creates empty parallel arrays for the given capacity
+        """
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as hash_map_oa.HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            out += str(i) + ': ' + str(self._entry(i) if self._states[i] != EMPTY else None) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Find the closest prime number from the given number in the shared prime table
+        """
+        return next_prime(capacity)
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        return is_prime(capacity)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _entry(self, index: int) -> HashEntry:
+        """
+        Helper method that builds a HashEntry view of the slot at the given index
+        """
+        entry = HashEntry(self._keys[index], self._values[index], self._hashes[index])
+        entry.is_tombstone = self._states[index] == TOMBSTONE
+        return entry
+
+    def _find(self, key: str, code: int) -> int:
+        """
+        Helper method that returns the slot holding the given key, or -1 if it is not in the hash map
+        """
+        capacity, states, hashes, keys = self._capacity, self._states, self._hashes, self._keys
+        home_index = code % capacity
+        probe_count = 0
+
+        while probe_count < capacity:
+            index = (home_index + probe_count * probe_count) % capacity
+            state = states[index]
+
+            if state == EMPTY:
+                # Reached an empty slot, key is not in the hash map
+                return -1
+
+            if state == LIVE and hashes[index] == code and keys[index] == key:
+                return index
+
+            probe_count += 1
+
+        return -1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method updates the key/value pair in the hash map
+
+        If the key exists, the associated value is replaced with the new value
+        If the key does not exist, a new key/value pair is added
+
+        The table's capacity is doubled if the current load factor is >= 0.5
+        """
+        code = self._hash_function(key) & _HASH_MASK
+        capacity, states, hashes, keys = self._capacity, self._states, self._hashes, self._keys
+        home_index = code % capacity
+        probe_count = 0
+        free_index = -1
+
+        while probe_count < capacity:
+            index = (home_index + probe_count * probe_count) % capacity
+            state = states[index]
+
+            if state == EMPTY:
+                break
+
+            if state == TOMBSTONE:
+                # Remember the first tombstone, but keep probing in case the key is further along
+                if free_index < 0:
+                    free_index = index
+
+            elif hashes[index] == code and keys[index] == key:
+                # Key already exists, update the value
+                self._values[index] = value
+                return
+
+            probe_count += 1
+
+        # The key is new, so check if resizing (or compacting) is needed before it is added
+        if self._size / self._capacity >= 0.5:
+            self._resize_internal(self._capacity * 2)
+        else:
+            self._compact_if_needed()
+
+        if self._states is not states:
+            # The rebuilt arrays have no tombstones, take the first empty slot of the key's probe sequence
+            free_index = self._empty_slot(code)
+        elif free_index >= 0:
+            # Reuse the first tombstone on the probe path
+            self._tombstones -= 1
+        elif probe_count < capacity:
+            free_index = index
+
+        if free_index < 0:
+            # Couldn't find an empty slot or tombstone after probing
+            raise DynamicArrayException("HashMap is full")
+
+        self._keys[free_index] = key
+        self._values[free_index] = value
+        self._hashes[free_index] = code
+        self._states[free_index] = LIVE
+        self._size += 1
+
+    def _empty_slot(self, code: int) -> int:
+        """
+        Helper method that returns the first empty slot of the probe sequence of the given hash code,
+        or -1 if the sequence runs out of slots
+        """
+        capacity, states = self._capacity, self._states
+        home_index = code % capacity
+
+        for probe_count in range(capacity):
+            index = (home_index + probe_count * probe_count) % capacity
+            if states[index] == EMPTY:
+                return index
+
+        return -1
+
+    def _compact_if_needed(self) -> None:
+        """
+        Helper method that rebuilds the arrays at the same capacity once live slots plus tombstones
+        reach 0.75 of the table, so probes stop walking long tombstone runs
+        """
+        if (self._size + self._tombstones) / self._capacity >= 0.75:
+            self._resize_internal(self._capacity)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method changes the capacity of the internal hash table
+        """
+        # Check that the new_capacity is not less than the current number of elements in the hash map
+        if new_capacity < self._size:
+            return
+
+        self._resize_internal(new_capacity)
+
+    def _resize_internal(self, new_capacity: int) -> None:
+        """
+        Internal method to resize the hash map
+        Move all live slots to the new arrays using their stored hash codes
+        """
+        old_arrays, old_capacity = (self._keys, self._values, self._hashes, self._states), self._capacity
+
+        new_capacity = self._next_prime(new_capacity)
+        while not self._rebuild(old_arrays, old_capacity, new_capacity):
+            # Quadratic probing reaches only about half of a prime table's slots, so a table that
+            # resize_table made more than half full can leave a key without a reachable slot
+            new_capacity = self._next_prime(2 * new_capacity)
+
+    def _rebuild(self, old_arrays: tuple, old_capacity: int, new_capacity: int) -> bool:
+        """
+        Helper method that moves the live slots of the old arrays into new arrays of the given
+        capacity, returning False if a key's probe sequence runs out of slots
+        """
+        old_keys, old_values, old_hashes, old_states = old_arrays
+
+        capacity = self._capacity = new_capacity
+        self._allocate(capacity)
+        self._tombstones = 0
+        keys, values, hashes, states = self._keys, self._values, self._hashes, self._states
+
+        for old_index in range(old_capacity):
+            if old_states[old_index] != LIVE:
+                continue
+
+            code = old_hashes[old_index]
+            home_index = code % capacity
+            probe_count = 0
+            index = home_index
+            while states[index] != EMPTY:
+                probe_count += 1
+                if probe_count == capacity:
+                    return False
+                index = (home_index + probe_count * probe_count) % capacity
+
+            keys[index] = old_keys[old_index]
+            values[index] = old_values[old_index]
+            hashes[index] = code
+            states[index] = LIVE
+
+        return True
+
+    def tombstone_buckets(self) -> int:
+        """
+        This method returns the number of tombstone buckets in the hash table
+        """
+        return self._tombstones
+
+    def table_load(self) -> float:
+        """
+        This method returns the current hash table load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets in the hash table
+        """
+        return self._states.count(EMPTY)
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key
+        """
+        index = self._find(key, self._hash_function(key) & _HASH_MASK)
+        return self._values[index] if index >= 0 else None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        return self._find(key, self._hash_function(key) & _HASH_MASK) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map
+        """
+        index = self._find(key, self._hash_function(key) & _HASH_MASK)
+        if index < 0:
+            return
+
+        # Mark the slot as a tombstone and drop the references it holds
+        self._states[index] = TOMBSTONE
+        self._keys[index] = None
+        self._values[index] = None
+        self._size -= 1
+        self._tombstones += 1
+        self._compact_if_needed()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method returns a dynamic array where each index contains a tuple of a key/value pair stored in the hash map
+        """
+        key_value_pairs = DynamicArray()
+        keys, values, states = self._keys, self._values, self._states
+        for index in range(self._capacity):
+            if states[index] == LIVE:
+                key_value_pairs.append((keys[index], values[index]))
+        return key_value_pairs
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def __iter__(self):
+        """
+        This method enables the hash map to iterate across itself, yielding a HashEntry view of every
+        live slot; every loop gets its own iterator, so nested loops do not interfere
+        """
+        for index in range(self._capacity):
+            if self._states[index] == LIVE:
+                yield self._entry(index)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nStruct of arrays - put example 1")
+    print("--------------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nStruct of arrays - contains_key example 1")
+    print("-----------------------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key))
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nStruct of arrays - __iter__(), __next__() example 1")
+    print("---------------------------------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
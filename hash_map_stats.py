@@ -0,0 +1,94 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Instrumentation
+# Due Date: December 8, 2023
+# Description: This program provides the fixed-bucket histograms the HashMaps use to record
+# probe counts (OA) and chain-walk lengths (SC) when instrumentation is turned on
+
+
+# Lengths below LINEAR_BUCKETS get a bucket each, longer ones share one bucket per power of two
+LINEAR_BUCKETS = 32
+BUCKETS = LINEAR_BUCKETS + 64
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of non-negative integer lengths
+    Mean and max are exact; percentiles are exact below LINEAR_BUCKETS and rounded up to
+    the next power of two above it
+    """
+
+    __slots__ = ('_counts', '_count', '_total', '_max')
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self._counts = [0] * BUCKETS
+        self._count = 0
+        self._total = 0
+        self._max = 0
+
+    @staticmethod
+    def _bucket(length: int) -> int:
+        """Return the bucket a length falls into."""
+        if length < LINEAR_BUCKETS:
+            return length
+        return LINEAR_BUCKETS + length.bit_length() - LINEAR_BUCKETS.bit_length()
+
+    @staticmethod
+    def _upper_bound(bucket: int) -> int:
+        """Return the largest length a bucket holds."""
+        if bucket < LINEAR_BUCKETS:
+            return bucket
+        return (LINEAR_BUCKETS << (bucket - LINEAR_BUCKETS + 1)) - 1
+
+    def record(self, length: int) -> None:
+        """Add one length to the histogram."""
+        self._counts[self._bucket(length)] += 1
+        self._count += 1
+        self._total += length
+        if length > self._max:
+            self._max = length
+
+    def percentile(self, fraction: float) -> int:
+        """Return the length at or below which the given fraction of the recorded lengths fall."""
+        if not self._count:
+            return 0
+        target = fraction * self._count
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if count and seen >= target:
+                return min(self._upper_bound(bucket), self._max)
+        return self._max
+
+    def summary(self) -> dict:
+        """Return the count, mean, p50, p99 and max of the recorded lengths."""
+        return {
+            'count': self._count,
+            'mean': self._total / self._count if self._count else 0.0,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'max': self._max,
+        }
+
+
+class OperationStats:
+    """
+    One histogram per HashMap operation (put, get, remove, contains_key)
+    """
+
+    OPERATIONS = ('put', 'get', 'remove', 'contains_key')
+
+    __slots__ = ('_histograms',)
+
+    def __init__(self) -> None:
+        """Initialize empty histograms for every operation."""
+        self._histograms = {operation: Histogram() for operation in self.OPERATIONS}
+
+    def record(self, operation: str, length: int) -> None:
+        """Add one probe count or chain-walk length for the given operation."""
+        self._histograms[operation].record(length)
+
+    def summary(self) -> dict:
+        """Return the summary of every operation's histogram."""
+        return {operation: histogram.summary() for operation, histogram in self._histograms.items()}
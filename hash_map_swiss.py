@@ -0,0 +1,292 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap Open Addressing (Swiss Table)
+# Due Date: December 8, 2023
+# Description: This program implements an Open Addressing HashMap modeled on Swiss tables: every slot has
+# a one-byte control value, and probing matches a whole group of 16 control bytes against 7 bits of the
+# hash at once, so keys are only compared in slots whose control byte matches
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+from hash_functions import mix64
+from hash_map_policy import GrowthPolicy
+import hash_map_oa
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional, fall back to a bytearray of control bytes
+    np = None
+
+
+# Control byte values: a full slot holds the low 7 bits of its key's mixed hash code
+EMPTY = 0x80
+DELETED = 0xFE
+
+# Slots per group, and the constants that compare all 16 control bytes of a group as one integer
+GROUP = 16
+_LANES = int.from_bytes(b'\x01' * GROUP, 'little')
+_HIGH_BITS = _LANES << 7
+
+
+class HashMap(hash_map_oa.HashMap):
+    """
+    Open Addressing HashMap with Swiss table control bytes and group probing
+    It shares the public API of hash_map_oa.HashMap
+
+    The table is a power of two number of 16-slot groups. A key's mixed hash code picks its first group
+    (the high bits) and its tag (the low 7 bits); lookups visit groups in triangular order, compare the
+    key only in slots whose control byte equals the tag, and stop at the first group with an empty slot
+    """
+
+    # Groups of 16 control bytes keep probe sequences short up to the 7/8 used by Swiss tables
+    _MAX_LOAD = 0.875
+    _DEFAULT_POLICY = GrowthPolicy(_MAX_LOAD)
+
+    def __init__(self, capacity: int, function, instrument: bool = False) -> None:
+        """
+        Initialize new HashMap that uses
+        Swiss table group probing for collision resolution
+
+        instrument turns on histograms of the keys each operation compares, read with stats()
+        """
+        # capacity is a power of two number of groups, snapshots re-place keys over a prime capacity
+        self._power_of_two = True
+        self._allocate(self._round_capacity(capacity))
+
+        self._init_state(function, self._DEFAULT_POLICY, instrument)
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Helper method that returns the capacity the table is built with: a power of two number of groups
+        """
+        group_count = -(-max(capacity, 1) // GROUP)
+        return GROUP << (group_count - 1).bit_length()
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper method that creates an empty table and its control bytes for the given (rounded) capacity
+        """
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._group_mask = capacity // GROUP - 1
+        self._buckets = DynamicArray([None] * capacity)
+
+        # Control bytes live in a NumPy uint8 array (a bytearray without NumPy); single bytes and
+        # groups are read and written through a memoryview, which skips NumPy's per-call overhead
+        if np is not None:
+            self._control = np.full(capacity, EMPTY, dtype=np.uint8)
+        else:
+            self._control = bytearray([EMPTY]) * capacity
+        self._view = memoryview(self._control)
+
+    def _group(self, start: int) -> int:
+        """
+        Helper method that returns the 16 control bytes of the group starting at start as one integer,
+        the first slot in the lowest byte
+        """
+        return int.from_bytes(self._view[start:start + GROUP], 'little')
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method updates the key/value pair in the hash map
+
+        If the key exists, the associated value is replaced with the new value
+        If the key does not exist, a new key/value pair is added
+
+        Once live and deleted slots reach 7/8 of the table, the capacity is doubled (or, when more
+        than half of them are deleted, the table is rebuilt at the same capacity)
+        """
+        code = self._hash_function(key)
+        mixed = mix64(code)
+        index = self._find(key, code, mixed, 'put')
+        if index >= 0:
+            # Key already exists, update the value
+            self._buckets[index].value = value
+            return
+
+        if self._size + self._tombstones >= self._MAX_LOAD * self._capacity:
+            if 2 * self._size >= self._MAX_LOAD * self._capacity:
+                self._resize_internal(self._capacity * 2)
+            else:
+                self._resize_internal(self._capacity)
+
+        self._place(HashEntry(key, value, code), mixed)
+        self._size += 1
+        self._version += 1
+
+    def _place(self, entry: HashEntry, mixed: int) -> None:
+        """
+        Helper method that puts an entry whose key is not in the hash map into the first empty or
+        deleted slot of its probe sequence
+        """
+        group = (mixed >> 7) & self._group_mask
+        for probe_count in range(1, self._group_mask + 2):
+            start = group * GROUP
+
+            # Empty and deleted control bytes are the ones with the high bit set
+            free = self._group(start) & _HIGH_BITS
+            if free:
+                index = start + ((free & -free).bit_length() >> 3) - 1
+                if self._view[index] == DELETED:
+                    self._tombstones -= 1
+                self._view[index] = mixed & 0x7F
+                self._buckets[index] = entry
+                return
+
+            group = (group + probe_count) & self._group_mask
+
+        raise RuntimeError("HashMap has no free slot")
+
+    def _find(self, key: str, code: int, mixed: int, operation: str) -> int:
+        """
+        Helper method that returns the slot of the given key, or -1 if it is not in the hash map
+        Each group is matched against the tag in one step, and only matching slots compare their key
+        """
+        tag_lanes = _LANES * (mixed & 0x7F)
+        buckets, view, group_mask = self._buckets, self._view, self._group_mask
+        group = (mixed >> 7) & group_mask
+        compared = 0
+        found = -1
+
+        for probe_count in range(1, group_mask + 2):
+            start = group * GROUP
+            control = int.from_bytes(view[start:start + GROUP], 'little')
+
+            # Lanes equal to the tag become zero bytes, which the classic zero-byte test flags
+            # (a lane just above a match can be flagged too, its key comparison simply fails)
+            lanes = control ^ tag_lanes
+            matches = (lanes - _LANES) & ~lanes & _HIGH_BITS
+            while matches:
+                index = start + ((matches & -matches).bit_length() >> 3) - 1
+                compared += 1
+                entry = buckets[index]
+                if entry.hash == code and entry.key == key:
+                    found = index
+                    break
+                matches &= matches - 1
+            if found >= 0:
+                break
+
+            # An empty slot (high bit set, bit 1 clear) ends the probe sequence
+            if control & (~control << 6) & _HIGH_BITS:
+                break
+
+            group = (group + probe_count) & group_mask
+
+        if self._stats is not None:
+            self._stats.record(operation, compared)
+        return found
+
+    def _resize_internal(self, new_capacity: int) -> None:
+        """
+        Internal method to resize the hash map
+        Reinsert all existing entries into the new table using their cached hash codes
+        """
+        old_buckets, old_control = self._buckets, self._control
+
+        # Full slots are the control bytes without the high bit
+        if np is not None:
+            full = np.flatnonzero(old_control < EMPTY).tolist()
+        else:
+            full = [index for index, control in enumerate(old_control) if control < EMPTY]
+
+        self._allocate(self._round_capacity(new_capacity))
+        self._tombstones = 0
+        for index in full:
+            entry = old_buckets[index]
+            self._place(entry, mix64(entry.hash))
+        self._version += 1
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets in the hash table
+        """
+        if np is not None:
+            return int(np.count_nonzero(self._control == EMPTY))
+        return self._control.count(EMPTY)
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with the given key
+        """
+        code = self._hash_function(key)
+        index = self._find(key, code, mix64(code), 'get')
+        return self._buckets[index].value if index >= 0 else None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method returns True if the given key is in the hash map, otherwise it returns False
+        """
+        code = self._hash_function(key)
+        return self._find(key, code, mix64(code), 'contains_key') >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes the given key and its associated value from the hash map
+        The slot becomes empty if its group still has an empty slot, since no probe sequence continues
+        past such a group, and becomes deleted otherwise
+        """
+        code = self._hash_function(key)
+        index = self._find(key, code, mix64(code), 'remove')
+        if index < 0:
+            return
+
+        self._buckets[index] = None
+        control = self._group(index - index % GROUP)
+        if control & (~control << 6) & _HIGH_BITS:
+            self._view[index] = EMPTY
+        else:
+            self._view[index] = DELETED
+            self._tombstones += 1
+        self._size -= 1
+        self._version += 1
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+        self._version += 1
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nSwiss table - put example 1")
+    print("---------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nSwiss table - contains_key example 1")
+    print("------------------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key))
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nSwiss table - remove example 1")
+    print("------------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
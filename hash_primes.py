@@ -0,0 +1,98 @@
+# Name: Ashlyn Musgrave
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: Prime Capacities
+# Due Date: December 8, 2023
+# Description: This program provides the prime capacities of the HashMaps from a sieve-generated table
+# of primes with bisect lookup, falling back to Miller-Rabin above the table
+
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from math import gcd, isqrt, prod
+
+
+# Every odd prime below SIEVE_LIMIT is kept (about 82,000 primes in 330 KB)
+SIEVE_LIMIT = 1 << 20
+
+# Miller-Rabin with these bases is exact for every n below 3.3 * 10**24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Product of the small odd primes, one gcd with it rejects most composites before Miller-Rabin
+_SMALL_PRIMES = prod((3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97))
+
+_primes = None
+
+
+def _table() -> array:
+    """
+    Helper method that returns the table of odd primes below SIEVE_LIMIT, sieving it on first use
+    """
+    global _primes
+    if _primes is None:
+        sieve = bytearray([1]) * SIEVE_LIMIT
+        sieve[0:2] = b'\0\0'
+        for factor in range(2, isqrt(SIEVE_LIMIT) + 1):
+            if sieve[factor]:
+                sieve[factor * factor::factor] = bytes(len(range(factor * factor, SIEVE_LIMIT, factor)))
+        sieve[2] = 0
+        _primes = array('I', compress(range(SIEVE_LIMIT), sieve))
+    return _primes
+
+
+def _miller_rabin(number: int) -> bool:
+    """
+    Helper method that tests an odd number above the small primes for primality
+    """
+    if gcd(number, _SMALL_PRIMES) != 1:
+        return False
+
+    exponent, shifts = number - 1, 0
+    while exponent % 2 == 0:
+        exponent //= 2
+        shifts += 1
+
+    for witness in _WITNESSES:
+        value = pow(witness, exponent, number)
+        if value == 1 or value == number - 1:
+            continue
+        for _ in range(shifts - 1):
+            value = value * value % number
+            if value == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(number: int) -> bool:
+    """
+    This method returns True if the given integer is a prime number, otherwise it returns False
+    """
+    if number < 2:
+        return False
+    if number % 2 == 0:
+        return number == 2
+    if number < SIEVE_LIMIT:
+        primes = _table()
+        index = bisect_left(primes, number)
+        return index < len(primes) and primes[index] == number
+    return _miller_rabin(number)
+
+
+def next_prime(capacity: int) -> int:
+    """
+    This method returns the smallest odd prime number that is at least the given capacity
+    (the same capacity the maps' original _next_prime walked to, which never returns 2)
+    """
+    if capacity <= 3:
+        return 3
+
+    primes = _table()
+    if capacity <= primes[-1]:
+        return primes[bisect_left(primes, capacity)]
+
+    # Above the table, walk the odd numbers with Miller-Rabin
+    capacity |= 1
+    while not _miller_rabin(capacity):
+        capacity += 2
+    return capacity